@@ -156,6 +156,8 @@ REST_FRAMEWORK = {
         "knox.auth.TokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_PAGINATION_CLASS": "events.pagination.KeysetPagination",
+    "PAGE_SIZE": 25,
 }
 
 # Caching configuration
@@ -181,6 +183,30 @@ else:
         }
     }
 
+# Anonymous full-page cache (events.middleware.AnonymousPageCacheMiddleware)
+ANONYMOUS_PAGE_CACHE = os.getenv("ANONYMOUS_PAGE_CACHE", "False").lower() in {
+    "true",
+    "1",
+    "yes",
+}
+ANONYMOUS_PAGE_CACHE_TIMEOUT = int(os.getenv("ANONYMOUS_PAGE_CACHE_TIMEOUT", "300"))
+ANONYMOUS_PAGE_CACHE_S_MAXAGE = int(os.getenv("ANONYMOUS_PAGE_CACHE_S_MAXAGE", "60"))
+
+# Outgoing webhooks: outbox worker (manage.py deliver_webhooks) and its
+# per-process pool (events.webhook_utils.WebhookDispatcher)
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "4"))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+WEBHOOK_ENQUEUE_TIMEOUT = float(os.getenv("WEBHOOK_ENQUEUE_TIMEOUT", "0"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "5"))
+WEBHOOK_LEASE_SECONDS = int(os.getenv("WEBHOOK_LEASE_SECONDS", "60"))
+WEBHOOK_RETRY_BASE_DELAY = int(os.getenv("WEBHOOK_RETRY_BASE_DELAY", "30"))
+WEBHOOK_RETRY_MAX_DELAY = int(os.getenv("WEBHOOK_RETRY_MAX_DELAY", str(6 * 60 * 60)))
+WEBHOOK_CIRCUIT_THRESHOLD = int(os.getenv("WEBHOOK_CIRCUIT_THRESHOLD", "5"))
+WEBHOOK_CIRCUIT_COOLDOWN = int(os.getenv("WEBHOOK_CIRCUIT_COOLDOWN", "300"))
+# Asyncio worker (manage.py run_webhook_worker, needs the "webhooks" extra)
+WEBHOOK_ASYNC_CONCURRENCY = int(os.getenv("WEBHOOK_ASYNC_CONCURRENCY", "1000"))
+WEBHOOK_PER_HOST_LIMIT = int(os.getenv("WEBHOOK_PER_HOST_LIMIT", "10"))
+
 # Knox token settings
 # Default: 12 hours (user can override per token)
 REST_KNOX = {
@@ -191,6 +217,9 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Serve static files efficiently
+    # Serves cached pages to anonymous visitors before any session work;
+    # inactive unless ANONYMOUS_PAGE_CACHE is enabled.
+    "events.middleware.AnonymousPageCacheMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -500,3 +529,5 @@ else:
     # Local filesystem storage (default for development)
     MEDIA_ROOT = os.path.join(BASE_DIR, "media")
     MEDIA_URL = "/media/"
+    # Private files (e.g. roster exports) kept out of MEDIA_ROOT
+    PRIVATE_MEDIA_ROOT = os.path.join(BASE_DIR, "private_media")
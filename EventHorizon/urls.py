@@ -33,13 +33,13 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from django.contrib.sitemaps.views import sitemap
+from django.contrib.sitemaps import views as sitemap_views
 from django.views.generic import TemplateView
 from oauth2_provider import urls as oauth2_urls
 import os
 from django.conf import settings
 from django.conf.urls.static import static
-from events.sitemaps import StaticViewSitemap, EventSitemap
+from events.sitemaps import StaticViewSitemap, EventSitemap, cached_sitemap
 
 admin.site.site_header = os.getenv("DJANGO_SITE_HEADER", "Event Horizon")
 admin.site.site_title = os.getenv("DJANGO_SITE_TITLE", "Event Horizon")
@@ -60,7 +60,13 @@ urlpatterns = [
     # SEO: Sitemap and Robots.txt
     path(
         "sitemap.xml",
-        sitemap,
+        cached_sitemap(sitemap_views.index),
+        {"sitemaps": sitemaps},
+        name="sitemap-index",
+    ),
+    path(
+        "sitemap-<section>.xml",
+        cached_sitemap(sitemap_views.sitemap),
         {"sitemaps": sitemaps},
         name="django.contrib.sitemaps.views.sitemap",
     ),
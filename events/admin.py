@@ -15,7 +15,9 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 from django.contrib import admin
-from .models import Event, Registration, Webhook
+from django.utils import timezone
+
+from .models import Event, ExportJob, Registration, Webhook, WebhookDelivery
 
 
 @admin.register(Event)
@@ -27,7 +29,10 @@ class EventAdmin(admin.ModelAdmin):
         "end_time",
         "location",
         "capacity",
+        "registered_count",
+        "waitlisted_count",
     )
+    readonly_fields = ("registered_count", "waitlisted_count", "cancelled_count")
     search_fields = ("title", "description", "location")
     list_filter = ("start_time", "created_at")
 
@@ -41,6 +46,43 @@ class RegistrationAdmin(admin.ModelAdmin):
 
 @admin.register(Webhook)
 class WebhookAdmin(admin.ModelAdmin):
-    list_display = ("event", "url", "is_active", "created_at")
+    list_display = ("event", "url", "is_active", "max_retries", "created_at")
     list_filter = ("is_active", "created_at")
     search_fields = ("event__title", "url")
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = (
+        "webhook",
+        "event_type",
+        "status",
+        "attempts",
+        "response_status",
+        "next_attempt_at",
+        "created_at",
+    )
+    list_filter = ("status", "event_type", "created_at")
+    search_fields = ("webhook__url", "webhook__event__title")
+    list_select_related = ("webhook__event",)
+    actions = ["retry_deliveries"]
+
+    @admin.action(description="Retry selected deliveries now")
+    def retry_deliveries(self, request, queryset):
+        queryset.exclude(status="delivered").update(
+            status="pending", attempts=0, next_attempt_at=timezone.now()
+        )
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "event",
+        "requested_by",
+        "format",
+        "status",
+        "row_count",
+        "created_at",
+    )
+    list_filter = ("status", "format", "created_at")
+    search_fields = ("event__title", "requested_by__username")
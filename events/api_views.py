@@ -14,17 +14,35 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+from django.db.models import F
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from .conditional import (
+    EVENT_ETAG_FIELDS,
+    REGISTRATION_ETAG_FIELDS,
+    compute_validators,
+    not_modified,
+    set_validators,
+)
 from .models import Event, Registration
 from .notifications import (
     send_organizer_registration_email,
     send_participant_registration_recorded_email,
 )
-from .serializers import EventSerializer, RegistrationSerializer
-from .webhook_utils import trigger_webhook_async
+from .registration import (
+    AlreadyRegistered,
+    EventFull,
+    admit_registration,
+    bulk_change_status,
+    withdraw_registration,
+)
+from .serializers import (
+    BulkStatusSerializer,
+    EventSerializer,
+    RegistrationSerializer,
+)
 
 
 class IsOrganizerOrReadOnly(permissions.BasePermission):
@@ -36,11 +54,87 @@ class IsOrganizerOrReadOnly(permissions.BasePermission):
         return obj.organizer == request.user
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class SparseFieldsetViewMixin:
+    """Fetch only the columns needed for ``?fields=`` / ``?omit=`` on reads."""
+
+    etag_fields = ()
+
+    def get_queryset(self):
+        return self.narrow_for_read(super().get_queryset())
+
+    def narrow_for_read(self, queryset):
+        if self.action in ("list", "retrieve"):
+            queryset = self.get_serializer().narrow_queryset(
+                queryset, extra=self.etag_fields
+            )
+        return queryset
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified handling for ``list`` and ``retrieve``.
+
+    The validators cover ``etag_fields`` of the returned rows, the user, the
+    full query string and the negotiated media type, and a match returns
+    ``304`` before serialization.
+    """
+
+    etag_fields = ("id", "updated_at")
+
+    def get_validators(self, objects, *, etag_fields=None, last_modified=True):
+        request = self.request
+        paginator = self.paginator
+        return compute_validators(
+            objects,
+            etag_fields or self.etag_fields,
+            request.user.pk,
+            request.get_full_path(),
+            request.accepted_media_type,
+            getattr(paginator, "has_next", None),
+            getattr(paginator, "has_previous", None),
+            last_modified=last_modified,
+        )
+
+    def conditional_list(self, queryset, *, serializer_class=None, etag_fields=None):
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset) if page is None else page
+        etag, last_modified = self.get_validators(
+            objects, etag_fields=etag_fields, last_modified=False
+        )
+        response = not_modified(self.request, etag, last_modified)
+        if response is not None:
+            return response
+
+        serializer_class = serializer_class or self.get_serializer_class()
+        serializer = serializer_class(
+            objects, many=True, context=self.get_serializer_context()
+        )
+        if page is None:
+            response = Response(serializer.data)
+        else:
+            response = self.get_paginated_response(serializer.data)
+        return set_validators(response, self.request, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(self.filter_queryset(self.get_queryset()))
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_validators([instance])
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), request, etag, last_modified)
+
+
+class EventViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """API endpoint that allows events to be viewed or edited."""
 
-    queryset = Event.objects.all().order_by("-start_time")
+    queryset = Event.objects.all().order_by("-start_time", "-id")
     serializer_class = EventSerializer
+    etag_fields = EVENT_ETAG_FIELDS
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOrganizerOrReadOnly]
 
     def perform_create(self, serializer):
@@ -55,51 +149,23 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         user = request.user
 
-        if Registration.objects.filter(event=event, participant=user).exists():
+        answers = request.data.get("answers", {})
+
+        try:
+            registration = admit_registration(
+                event=event, participant=user, answers=answers
+            )
+        except AlreadyRegistered:
             return Response(
                 {"detail": "You are already registered for this event."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        answers = request.data.get("answers", {})
-
-        current_registrations = Registration.objects.filter(
-            event=event, status="registered"
-        ).count()
-
-        status_value = "registered"
-        if current_registrations >= event.capacity:
-            status_value = "waitlisted"
-
-        registration = Registration.objects.create(
-            event=event,
-            participant=user,
-            status=status_value,
-            answers=answers,
-        )
-
         send_organizer_registration_email(registration=registration, request=request)
         send_participant_registration_recorded_email(
             registration=registration, request=request
         )
 
-        webhooks = event.webhooks.filter(is_active=True)
-        if webhooks.exists():
-            payload = {
-                "event": "registration.created",
-                "mission_id": event.slug,
-                "mission_title": event.title,
-                "participant": {
-                    "username": user.username,
-                    "email": user.email,
-                },
-                "status": registration.status,
-                "registered_at": registration.registered_at,
-                "answers": registration.answers,
-            }
-            for webhook in webhooks:
-                trigger_webhook_async(webhook.url, payload)
-
         serializer = RegistrationSerializer(registration)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -114,7 +180,7 @@ class EventViewSet(viewsets.ModelViewSet):
 
         try:
             registration = Registration.objects.get(event=event, participant=user)
-            registration.delete()
+            withdraw_registration(registration, request=request)
             return Response(
                 {"detail": "Successfully unregistered from the event."},
                 status=status.HTTP_204_NO_CONTENT,
@@ -139,20 +205,74 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        registrations = Registration.objects.filter(event=event).order_by(
-            "-registered_at"
+        context = self.get_serializer_context()
+        registrations = RegistrationSerializer(context=context).narrow_queryset(
+            Registration.objects.filter(event=event).order_by("-registered_at", "-id"),
+            extra=REGISTRATION_ETAG_FIELDS,
+        )
+        # The rows carry the event title, so the event's state is part of
+        # every row's validator.
+        registrations = registrations.annotate(event_updated_at=F("event__updated_at"))
+        return self.conditional_list(
+            registrations,
+            serializer_class=RegistrationSerializer,
+            etag_fields=REGISTRATION_ETAG_FIELDS + ("event_updated_at",),
+        )
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="registrations/bulk-status",
+        url_name="registrations-bulk-status",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def bulk_status(self, request, pk=None):
+        """Move many registrations to one status (organizer only)."""
+
+        event = self.get_object()
+
+        if event.organizer != request.user:
+            return Response(
+                {"detail": "Only the event organizer can manage registrations."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            changed = bulk_change_status(
+                event=event,
+                registration_ids=serializer.validated_data["ids"],
+                new_status=serializer.validated_data["status"],
+                request=request,
+            )
+        except EventFull:
+            return Response(
+                {"detail": "Not enough seats left to approve these registrations."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(
+            {
+                "status": serializer.validated_data["status"],
+                "updated": [registration.pk for registration in changed],
+            }
         )
-        serializer = RegistrationSerializer(registrations, many=True)
-        return Response(serializer.data)
 
 
-class RegistrationViewSet(viewsets.ReadOnlyModelViewSet):
+class RegistrationViewSet(
+    ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet
+):
     """API endpoint to view user's own registrations."""
 
     serializer_class = RegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_fields = REGISTRATION_ETAG_FIELDS + ("event_updated_at",)
 
     def get_queryset(self):
-        return Registration.objects.filter(participant=self.request.user).order_by(
-            "-registered_at"
-        )
+        queryset = Registration.objects.filter(participant=self.request.user)
+        queryset = self.narrow_for_read(queryset.order_by("-registered_at", "-id"))
+        # The rows carry the event title, so the event's state is part of
+        # every row's validator.
+        return queryset.annotate(event_updated_at=F("event__updated_at"))
@@ -19,3 +19,6 @@ from django.apps import AppConfig
 
 class EventsConfig(AppConfig):
     name = "events"
+
+    def ready(self):  # type: ignore[override]
+        import events.signals  # type: ignore[import-not-found]  # noqa: F401
@@ -0,0 +1,167 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Prefix suggestions for the event list search boxes.
+
+On PostgreSQL the lookups are ``UPPER(column) LIKE 'PREFIX%'`` queries served
+by the trigram GIN indexes from migration ``0011``. Other databases use a
+:class:`PrefixIndex`: a sorted, case-folded list of every title and location
+held in process memory and answered with two binary searches. Saving or
+deleting an event in this process marks it dirty, and it also expires after
+``AUTOCOMPLETE_INDEX_TTL`` seconds. Either way it is rebuilt on a background
+thread while requests keep being answered from the previous index; only the
+very first request in a process waits for a build.
+
+Either way, :func:`suggest` caches each prefix's answer for
+``AUTOCOMPLETE_CACHE_TIMEOUT`` seconds.
+"""
+
+import hashlib
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import Event
+
+MIN_PREFIX_LENGTH = 2
+MAX_SUGGESTIONS = 8
+
+
+class PrefixIndex:
+    """Sorted ``(folded, value)`` pairs supporting prefix range scans."""
+
+    def __init__(self, values):
+        entries = {(value.casefold(), value) for value in values if value}
+        self._entries = sorted(entries)
+        self._keys = [folded for folded, _ in self._entries]
+
+    def lookup(self, prefix, limit):
+        folded = prefix.casefold()
+        start = bisect_left(self._keys, folded)
+        matches = []
+        for key, value in self._entries[start:]:
+            if not key.startswith(folded) or len(matches) == limit:
+                break
+            matches.append(value)
+        return matches
+
+
+class InProcessSuggester:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._dirty = False
+        self._rebuilding = False
+        self._titles = self._locations = None
+
+    def invalidate(self):
+        self._dirty = True
+
+    def _load(self):
+        rows = list(Event.objects.values_list("title", "location"))
+        titles = PrefixIndex(title for title, _ in rows)
+        locations = PrefixIndex(location for _, location in rows)
+        return titles, locations, time.monotonic()
+
+    def _rebuild(self):
+        try:
+            built = self._load()
+            with self._lock:
+                self._titles, self._locations, self._built_at = built
+        finally:
+            self._rebuilding = False
+
+    def _rebuild_in_thread(self):
+        try:
+            self._rebuild()
+        finally:
+            connection.close()
+
+    def _indexes(self):
+        ttl = getattr(settings, "AUTOCOMPLETE_INDEX_TTL", 300)
+        with self._lock:
+            if self._titles is None:
+                # Nothing to serve yet: the first request waits for a build.
+                self._dirty = False
+                self._titles, self._locations, self._built_at = self._load()
+            elif not self._rebuilding and (
+                self._dirty or time.monotonic() - self._built_at > ttl
+            ):
+                # Cleared before the rebuild reads, so an event saved while it
+                # runs marks the index dirty again.
+                self._dirty = False
+                self._rebuilding = True
+                threading.Thread(
+                    target=self._rebuild_in_thread,
+                    name="autocomplete-index",
+                    daemon=True,
+                ).start()
+            return self._titles, self._locations
+
+    def suggest(self, prefix, limit):
+        titles, locations = self._indexes()
+        return {
+            "titles": titles.lookup(prefix, limit),
+            "locations": locations.lookup(prefix, limit),
+        }
+
+
+class DatabaseSuggester:
+    def invalidate(self):
+        pass
+
+    def _column(self, column, prefix, limit):
+        return list(
+            Event.objects.filter(**{f"{column}__istartswith": prefix})
+            .order_by(column)
+            .values_list(column, flat=True)
+            .distinct()[:limit]
+        )
+
+    def suggest(self, prefix, limit):
+        return {
+            "titles": self._column("title", prefix, limit),
+            "locations": self._column("location", prefix, limit),
+        }
+
+
+_in_process = InProcessSuggester()
+
+
+def get_suggester():
+    if connection.vendor == "postgresql":
+        return DatabaseSuggester()
+    return _in_process
+
+
+def suggest(prefix, limit=MAX_SUGGESTIONS):
+    """Return ``{"titles": [...], "locations": [...]}`` starting with ``prefix``."""
+    prefix = prefix.strip()
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return {"titles": [], "locations": []}
+
+    digest = hashlib.md5(prefix.casefold().encode()).hexdigest()
+    key = f"events:autocomplete:{limit}:{digest}"
+    result = cache.get(key)
+    if result is None:
+        result = get_suggester().suggest(prefix, limit)
+        cache.set(key, result, getattr(settings, "AUTOCOMPLETE_CACHE_TIMEOUT", 60))
+    return result
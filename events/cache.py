@@ -0,0 +1,179 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tag-versioned caching with stampede protection.
+
+Cached values are stored under a key that embeds the current version of every
+tag they depend on. Invalidation never deletes anything: :func:`invalidate`
+bumps the tag versions, so the next read builds a new key and the old entry
+simply expires. The signal handlers in :mod:`events.signals` and the counter
+updates in :mod:`events.registration` invalidate ``event:<pk>`` whenever an
+event or one of its registrations changes, and ``"events"`` only when the
+change shows on event lists, so cached data can use long timeouts and still
+be current.
+
+:func:`get_or_set` also guards against stampedes. Each entry has a soft expiry
+a little before its hard one. The first reader past the soft expiry takes a
+short ``cache.add`` lock and rebuilds the value, while other readers keep
+serving the stale copy. On a cold miss, readers that lose the lock wait
+briefly for the winner's value instead of all querying the database at once.
+
+Tag versions only reach every process when the cache is shared (Redis). With
+the per-process ``LocMemCache`` a bump is seen only by the process that made
+it, so :func:`cache_timeout` caps timeouts at ``LOCAL_CACHE_TIMEOUT`` there to
+bound how long other processes keep serving superseded entries.
+"""
+
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Event
+
+EVENTS_TAG = "events"
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 0.05
+LOCK_RETRIES = 10
+STALE_GRACE = 60
+LOCAL_CACHE_TIMEOUT = 60
+
+
+def is_shared_cache():
+    """Whether the default cache is seen by every process."""
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def cache_timeout(timeout=None):
+    """
+    Return ``timeout`` (default ``settings.EVENT_CACHE_TIMEOUT``), capped at
+    ``LOCAL_CACHE_TIMEOUT`` when the cache is local to this process.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "EVENT_CACHE_TIMEOUT", 300)
+    if not is_shared_cache():
+        timeout = min(timeout, LOCAL_CACHE_TIMEOUT)
+    return timeout
+
+
+def event_tag(event_id):
+    return f"event:{event_id}"
+
+
+def _version_key(tag):
+    return f"cache-tag:{tag}"
+
+
+def tag_versions(tags):
+    """Return the current version of each tag, initialising missing ones."""
+    keys = {tag: _version_key(tag) for tag in tags}
+    stored = cache.get_many(keys.values())
+    versions = {}
+    for tag, key in keys.items():
+        if key not in stored:
+            # Start from the clock, not 1, so a version evicted from the cache
+            # never comes back as a value an old entry was stored under.
+            cache.add(key, time.time_ns(), timeout=None)
+            stored[key] = cache.get(key)
+        versions[tag] = stored[key]
+    return versions
+
+
+def invalidate(*tags):
+    """Bump ``tags`` so every entry that depends on them is rebuilt."""
+    for tag in tags:
+        try:
+            cache.incr(_version_key(tag))
+        except ValueError:
+            cache.set(_version_key(tag), time.time_ns(), timeout=None)
+
+
+def invalidate_on_commit(*tags):
+    """Invalidate ``tags`` once the current transaction commits."""
+    transaction.on_commit(partial(invalidate, *tags))
+
+
+def invalidate_event(event_id, *, listing=False):
+    """
+    Invalidate ``event:<pk>`` after commit. Pass ``listing=True`` when the
+    change also shows on event lists (created, deleted, or one of
+    ``Event.LISTING_FIELDS`` edited) to bump the ``events`` tag as well.
+    """
+    tags = [event_tag(event_id)]
+    if listing:
+        tags.append(EVENTS_TAG)
+    invalidate_on_commit(*tags)
+
+
+def versioned_key(key, tags):
+    versions = tag_versions(tags)
+    fingerprint = ":".join(f"{tag}={versions[tag]}" for tag in sorted(versions))
+    digest = hashlib.md5(fingerprint.encode()).hexdigest()
+    return f"{key}:{digest}"
+
+
+def get_or_set(key, build, *, tags=(), timeout=None):
+    """
+    Return the cached value of ``build()`` for ``key`` under ``tags``.
+
+    ``timeout`` goes through :func:`cache_timeout`, so it defaults to
+    ``settings.EVENT_CACHE_TIMEOUT`` (300 seconds) and is capped when the
+    cache is not shared.
+    """
+    timeout = cache_timeout(timeout)
+    full_key = versioned_key(key, tags)
+    lock_key = f"{full_key}:lock"
+
+    entry = cache.get(full_key)
+    if entry is not None:
+        value, refresh_at = entry
+        if time.time() < refresh_at or not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return value
+    elif not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        for _ in range(LOCK_RETRIES):
+            time.sleep(LOCK_WAIT)
+            entry = cache.get(full_key)
+            if entry is not None:
+                return entry[0]
+        # The rebuilding process is slow or gone; build without the lock.
+        return build()
+
+    try:
+        value = build()
+        grace = STALE_GRACE if is_shared_cache() else 0
+        cache.set(full_key, (value, time.time() + timeout), timeout + grace)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+def upcoming_events(limit=3):
+    """The next ``limit`` events, shared by the home and about pages."""
+
+    def build():
+        return list(
+            Event.objects.filter(start_time__gte=timezone.now())
+            .order_by("start_time")[:limit]
+            .only("id", "slug", "title", "start_time", "location")
+        )
+
+    return get_or_set(f"home:upcoming_events:{limit}", build, tags=[EVENTS_TAG])
@@ -0,0 +1,79 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+HTTP validators (``ETag`` / ``Last-Modified``) for event pages and the API.
+
+Validators are computed from columns that are already loaded. For events
+that means ``updated_at`` plus the registration counters;
+:mod:`events.registration` bumps ``updated_at`` together with the counters.
+A matching ``If-None-Match`` / ``If-Modified-Since`` is answered with
+``304 Not Modified`` before anything is serialized or rendered.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+EVENT_ETAG_FIELDS = (
+    "id",
+    "updated_at",
+    "registered_count",
+    "waitlisted_count",
+    "cancelled_count",
+)
+REGISTRATION_ETAG_FIELDS = ("id", "updated_at", "status")
+
+
+def compute_validators(objects, fields, *extra, last_modified=True):
+    """
+    Return ``(etag, last_modified)`` for ``objects``.
+
+    The ETag hashes ``fields`` of every object plus ``extra`` (anything else
+    the representation depends on, such as the user or the query string).
+    ``Last-Modified`` is the newest ``updated_at``. Pass
+    ``last_modified=False`` for lists: dropping a row from a page can leave the
+    newest ``updated_at`` unchanged, so only the ETag is reliable there.
+    """
+    objects = list(objects)
+    state = [tuple(getattr(obj, field) for field in fields) for obj in objects]
+    digest = hashlib.sha1(repr((state, extra)).encode()).hexdigest()
+    modified = None
+    if last_modified and objects:
+        modified = int(max(obj.updated_at for obj in objects).timestamp())
+    return f'"{digest}"', modified
+
+
+def not_modified(request, etag, last_modified):
+    """Return a ``304`` response when the client's copy is current, else ``None``."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, request, etag, last_modified)
+    return response
+
+
+def set_validators(response, request, etag, last_modified):
+    """Attach the validators and require clients to revalidate before reuse."""
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+
+    directives = {"no_cache": True}
+    if request.user.is_authenticated:
+        directives["private"] = True
+    patch_cache_control(response, **directives)
+    return response
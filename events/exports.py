@@ -0,0 +1,289 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Roster exports.
+
+The synchronous CSV download and the background :class:`ExportJob` worker
+share the column layout and row iterator defined here. Background jobs can
+additionally write NDJSON, XLSX (requires ``openpyxl``) and Parquet (requires
+``pyarrow``); the finished file is saved to the private storage backend.
+"""
+
+import csv
+import json
+import os
+import tempfile
+from datetime import timedelta
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from storage.factory import get_private_storage
+
+from .models import ExportJob
+
+BASE_HEADERS = ["Username", "Email", "Status", "Registered At"]
+
+# Optional third-party modules needed by some formats
+FORMAT_REQUIREMENTS = {"xlsx": "openpyxl", "parquet": "pyarrow"}
+
+FILE_EXTENSIONS = {
+    "csv": "csv",
+    "ndjson": "ndjson",
+    "xlsx": "xlsx",
+    "parquet": "parquet",
+}
+
+
+def available_formats():
+    """Return the export formats whose dependencies are importable."""
+    return [
+        value
+        for value, _ in ExportJob.FORMAT_CHOICES
+        if value not in FORMAT_REQUIREMENTS
+        or find_spec(FORMAT_REQUIREMENTS[value]) is not None
+    ]
+
+
+def roster_columns(event):
+    """Return ``(headers, question_ids)`` for the event's registration schema."""
+    headers = list(BASE_HEADERS)
+    question_ids = []
+    for question in event.registration_schema or []:
+        headers.append(question["label"])
+        question_ids.append(question["id"])
+    return headers, question_ids
+
+
+def unique_headers(headers, question_ids):
+    """
+    Return ``headers`` with repeated names made unique.
+
+    CSV and XLSX can carry two columns with the same title, but NDJSON keys
+    and Parquet fields cannot. A question whose label is already taken, by
+    another question or by a base column, gets its id appended.
+    """
+    base = len(BASE_HEADERS)
+    keys = headers[:base]
+    seen = set(keys)
+    for label, q_id in zip(headers[base:], question_ids):
+        key = label
+        if key in seen:
+            key = f"{label} ({q_id})"
+        suffix = 2
+        while key in seen:
+            key = f"{label} ({q_id}) {suffix}"
+            suffix += 1
+        seen.add(key)
+        keys.append(key)
+    return keys
+
+
+def iter_roster_rows(event, question_ids, chunk_size=2000):
+    """
+    Yield one list per registration: username, email, status, registered_at
+    and the raw answer for each schema question.
+
+    Rows are read through ``iterator()``, i.e. a server-side cursor on
+    PostgreSQL, so memory stays flat however large the roster is.
+    """
+    registrations = (
+        event.registrations.order_by("id")
+        .values_list(
+            "participant__username",
+            "participant__email",
+            "status",
+            "registered_at",
+            "answers",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    for username, email, status_value, registered_at, answers in registrations:
+        answers = answers or {}
+        yield [username, email, status_value, registered_at] + [
+            answers.get(q_id, "") for q_id in question_ids
+        ]
+
+
+def csv_row(row):
+    """Format a roster row the way the CSV download always has."""
+    cells = row[:3] + [row[3].strftime("%Y-%m-%d %H:%M:%S")]
+    for answer in row[4:]:
+        if isinstance(answer, bool):
+            answer = "Yes" if answer else "No"
+        cells.append(answer)
+    return cells
+
+
+def _text_cell(value):
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _write_csv(path, headers, rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(csv_row(row))
+
+
+def _write_ndjson(path, headers, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    with open(path, "w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(encoder.encode(dict(zip(headers, row))))
+            handle.write("\n")
+
+
+def _write_xlsx(path, headers, rows):
+    from openpyxl import Workbook
+
+    # Write-only workbooks stream rows to disk instead of keeping them in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Roster")
+    sheet.append(headers)
+    for row in rows:
+        registered_at = timezone.make_naive(row[3], timezone.get_current_timezone())
+        sheet.append(
+            row[:3] + [registered_at] + [_text_cell(value) for value in row[4:]]
+        )
+    workbook.save(path)
+
+
+def _write_parquet(path, headers, rows, batch_size=5000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [pa.field(header, pa.string()) for header in headers[:3]]
+        + [pa.field(headers[3], pa.timestamp("us", tz="UTC"))]
+        + [pa.field(header, pa.string()) for header in headers[4:]]
+    )
+
+    def flush(writer, batch):
+        columns = [list(column) for column in zip(*batch)]
+        writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row[:4] + [_text_cell(value) for value in row[4:]])
+            if len(batch) >= batch_size:
+                flush(writer, batch)
+                batch = []
+        if batch:
+            flush(writer, batch)
+
+
+WRITERS = {
+    "csv": _write_csv,
+    "ndjson": _write_ndjson,
+    "xlsx": _write_xlsx,
+    "parquet": _write_parquet,
+}
+
+
+def claim_next_job():
+    """
+    Mark the oldest pending job as running and return it (or ``None``).
+
+    ``skip_locked`` lets several workers poll the queue without handing the
+    same job out twice. A job left ``running`` for longer than
+    ``EXPORT_JOB_TIMEOUT`` seconds belonged to a worker that died, and is
+    handed out again.
+    """
+    stale = timezone.now() - timedelta(
+        seconds=getattr(settings, "EXPORT_JOB_TIMEOUT", 60 * 60)
+    )
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="pending") | Q(status="running", started_at__lt=stale))
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = "running"
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def run_export_job(job):
+    """Write the job's export file to private storage and record the outcome."""
+    if job.format not in available_formats():
+        job.status = "failed"
+        job.error = (
+            f"{job.get_format_display()} export requires the "
+            f"'{FORMAT_REQUIREMENTS[job.format]}' package."
+        )
+        job.completed_at = timezone.now()
+        job.save(update_fields=["status", "error", "completed_at"])
+        return job
+
+    event = job.event
+    headers, question_ids = roster_columns(event)
+    if job.format in ("ndjson", "parquet"):
+        headers = unique_headers(headers, question_ids)
+    row_count = 0
+
+    def counted(rows):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+
+    fd, path = tempfile.mkstemp(suffix=f".{FILE_EXTENSIONS[job.format]}")
+    os.close(fd)
+    try:
+        WRITERS[job.format](
+            path, headers, counted(iter_roster_rows(event, question_ids))
+        )
+        stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+        name = (
+            f"exports/{event.slug}/{event.slug}_roster_{job.pk}_{stamp}."
+            f"{FILE_EXTENSIONS[job.format]}"
+        )
+        with open(path, "rb") as handle:
+            job.file_name = get_private_storage().save(name, File(handle))
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc)
+    else:
+        job.status = "completed"
+        job.row_count = row_count
+        job.error = ""
+    finally:
+        os.unlink(path)
+
+    job.completed_at = timezone.now()
+    job.save(
+        update_fields=["status", "file_name", "row_count", "error", "completed_at"]
+    )
+    return job
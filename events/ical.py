@@ -0,0 +1,191 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+iCalendar (RFC 5545) export for single events and per-user feeds.
+
+Each event is rendered to a ``VEVENT`` block once per version of the fields
+the block shows (:data:`EVENT_FIELDS`). The block is cached under a key that
+hashes those fields, so editing an event just produces a new key and nothing
+has to be invalidated. ``updated_at`` is deliberately not used: registrations
+bump it on every sign-up without changing anything a calendar shows. A feed
+is put together from these blocks with one ``get_many``; blocks missing from
+the cache are rendered from the rows the feed already loaded.
+
+Feeds are addressed by a signed token instead of a session, because calendar
+clients poll without cookies. The token also carries the profile's
+``calendar_feed_version``, so a user who leaked a link can bump the version
+and every link issued before stops working. Tokens do not expire on their own;
+a subscription has to keep working for as long as the user wants it.
+"""
+
+import hashlib
+from datetime import timezone as dt_timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F
+from django.urls import reverse
+
+from users.models import Profile
+
+PRODID = "-//Event Horizon//Events//EN"
+FEED_TOKEN_SALT = "events.ical.feed"
+FEED_REFRESH_INTERVAL = "PT15M"
+COMPONENT_TIMEOUT = 60 * 60 * 24
+LINE_LIMIT = 75
+
+# Everything render_event reads; nothing else may change the block.
+EVENT_FIELDS = (
+    "id",
+    "slug",
+    "title",
+    "description",
+    "location",
+    "start_time",
+    "end_time",
+    "created_at",
+)
+
+
+def feed_token(user):
+    """Return the token that addresses ``user``'s subscription feed."""
+    profile, _ = Profile.objects.get_or_create(user=user)
+    return signing.dumps([user.pk, profile.calendar_feed_version], salt=FEED_TOKEN_SALT)
+
+
+def reset_feed_token(user):
+    """Revoke every feed token issued to ``user`` so far."""
+    Profile.objects.get_or_create(user=user)
+    Profile.objects.filter(user=user).update(
+        calendar_feed_version=F("calendar_feed_version") + 1
+    )
+
+
+def user_id_for_token(token):
+    """
+    Return the user id signed into ``token``, or ``None`` if it is invalid
+    or has been revoked.
+    """
+    try:
+        value = signing.loads(token, salt=FEED_TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+    user_id, version = value
+    if not Profile.objects.filter(
+        user_id=user_id, calendar_feed_version=version
+    ).exists():
+        return None
+    return user_id
+
+
+def escape_text(value):
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold(line):
+    """Split ``line`` into 75-octet pieces, as the RFC requires."""
+    encoded = line.encode()
+    if len(encoded) <= LINE_LIMIT:
+        return line
+
+    pieces = []
+    start = 0
+    limit = LINE_LIMIT
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never cut a multi-byte character in half.
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(encoded[start:end].decode())
+        start = end
+        # Continuation lines start with a space, which counts towards the limit.
+        limit = LINE_LIMIT - 1
+    return "\r\n ".join(pieces)
+
+
+def render_event(event, host, scheme="https"):
+    """Return the ``VEVENT`` block for ``event``, ending with CRLF."""
+    url = f"{scheme}://{host}{reverse('event-detail', args=[event.slug])}"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.pk}@{host}",
+        f"DTSTAMP:{format_datetime(event.created_at)}",
+        f"DTSTART:{format_datetime(event.start_time)}",
+        f"DTEND:{format_datetime(event.end_time)}",
+        f"SUMMARY:{escape_text(event.title)}",
+        f"LOCATION:{escape_text(event.location)}",
+        f"DESCRIPTION:{escape_text(event.description)}",
+        f"URL:{url}",
+        "END:VEVENT",
+    ]
+    return "".join(f"{fold(line)}\r\n" for line in lines)
+
+
+def _component_key(event, host, scheme):
+    state = repr(tuple(getattr(event, field) for field in EVENT_FIELDS))
+    digest = hashlib.sha1(state.encode()).hexdigest()
+    return f"ical:vevent:{event.id}:{digest}:{scheme}:{host}"
+
+
+def render_components(events, host, scheme="https"):
+    """
+    Return the ``VEVENT`` blocks for ``events``, in the same order.
+
+    ``events`` need only carry :data:`EVENT_FIELDS`. Blocks are read from
+    the cache in one round trip; missing ones are rendered and stored for
+    the next poll.
+    """
+    keys = [_component_key(event, host, scheme) for event in events]
+    cached = cache.get_many(keys)
+    rendered = {
+        key: render_event(event, host, scheme)
+        for event, key in zip(events, keys)
+        if key not in cached
+    }
+    if rendered:
+        cache.set_many(rendered, COMPONENT_TIMEOUT)
+        cached.update(rendered)
+    return [cached[key] for key in keys]
+
+
+def render_calendar(components, name=None):
+    """Wrap ``VEVENT`` blocks in a ``VCALENDAR``."""
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+    ]
+    if name:
+        header += [
+            f"X-WR-CALNAME:{escape_text(name)}",
+            f"REFRESH-INTERVAL;VALUE=DURATION:{FEED_REFRESH_INTERVAL}",
+            f"X-PUBLISHED-TTL:{FEED_REFRESH_INTERVAL}",
+        ]
+    head = "".join(f"{fold(line)}\r\n" for line in header)
+    return head + "".join(components) + "END:VCALENDAR\r\n"
@@ -0,0 +1,116 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Request-scoped batch loaders for the API serializers.
+
+A serializer field that needs a related row asks a :class:`BatchLoader` for it
+by key instead of following the foreign key. List serializers *prime* the
+loaders with every key on the page first, so the first lookup resolves the
+whole page in one query and the rest are served from the loader's cache.
+Loaders live on the request, so nested serializers and repeated lookups share
+one cache per request.
+"""
+
+from django.contrib.auth import get_user_model
+
+from .models import Event, Registration
+
+
+class BatchLoader:
+    """
+    Collect keys and resolve them with one call to ``batch_fn``.
+
+    ``batch_fn`` receives a list of keys and returns a ``{key: value}`` dict;
+    keys missing from the result resolve to ``None``.
+    """
+
+    def __init__(self, batch_fn):
+        self.batch_fn = batch_fn
+        self._cache = {}
+        self._pending = set()
+
+    def enqueue(self, keys):
+        self._pending.update(key for key in keys if key not in self._cache)
+
+    def load(self, key):
+        if key not in self._cache:
+            self._pending.add(key)
+            self._dispatch()
+        return self._cache.get(key)
+
+    def _dispatch(self):
+        keys, self._pending = list(self._pending), set()
+        results = self.batch_fn(keys)
+        for key in keys:
+            self._cache[key] = results.get(key)
+
+
+class RequestLoaders:
+    """The loaders available to serializers during one request."""
+
+    def __init__(self, user=None):
+        self.user = user if user is not None and user.is_authenticated else None
+        self.users = BatchLoader(get_user_model().objects.in_bulk)
+        self.events = BatchLoader(Event.objects.in_bulk)
+        self.registration_ids = BatchLoader(self._registration_ids)
+        self.is_registered = BatchLoader(self._is_registered)
+
+    def _registration_ids(self, event_ids):
+        ids_by_event = {event_id: [] for event_id in event_ids}
+        rows = (
+            Registration.objects.filter(event_id__in=event_ids)
+            .order_by("id")
+            .values_list("event_id", "id")
+        )
+        for event_id, registration_id in rows:
+            ids_by_event[event_id].append(registration_id)
+        return ids_by_event
+
+    def _is_registered(self, event_ids):
+        registered = set()
+        if self.user is not None:
+            registered = set(
+                Registration.objects.filter(
+                    participant=self.user, event_id__in=event_ids
+                ).values_list("event_id", flat=True)
+            )
+        return {event_id: event_id in registered for event_id in event_ids}
+
+
+def get_loaders(context):
+    """Return the loaders for the serializer ``context``, creating them once."""
+    request = context.get("request")
+    if request is None:
+        return context.setdefault("_batch_loaders", RequestLoaders())
+
+    loaders = getattr(request, "_batch_loaders", None)
+    if loaders is None:
+        loaders = request._batch_loaders = RequestLoaders(request.user)
+    return loaders
+
+
+def load_related(instance, field_name, loader):
+    """
+    Return ``instance.<field_name>`` via ``loader`` unless it is already cached.
+
+    Objects built in the view (``registration.event = event``) keep their
+    related instance; everything else goes through the batch.
+    """
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        return getattr(instance, field_name)
+    return loader.load(getattr(instance, field.attname))
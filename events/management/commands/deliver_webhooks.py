@@ -0,0 +1,67 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.notifications import send_queued_status_changed_emails
+from events.webhook_utils import deliver_due
+
+
+class Command(BaseCommand):
+    help = (
+        "Send pending webhook deliveries from the outbox, retrying failures, "
+        "and queued status-changed emails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the deliveries that are due now and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when nothing is due (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            emails = send_queued_status_changed_emails()
+            if emails:
+                self.stdout.write(f"Sent {emails} status-changed emails")
+            deliveries = deliver_due()
+            for delivery in deliveries:
+                if delivery.status == "dead":
+                    self.stderr.write(
+                        f"Delivery {delivery.pk} to {delivery.webhook.url} dead after "
+                        f"{delivery.attempts} attempts: {delivery.last_error}"
+                    )
+            if deliveries:
+                delivered = sum(d.status == "delivered" for d in deliveries)
+                self.stdout.write(
+                    f"Sent {len(deliveries)} webhook deliveries, {delivered} delivered"
+                )
+                continue
+            if emails:
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
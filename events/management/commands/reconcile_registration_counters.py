@@ -0,0 +1,73 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from events.models import Event
+from events.registration import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute Event registration counters from the Registration table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of events to reconcile per transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--event",
+            dest="slugs",
+            action="append",
+            default=[],
+            help="Only reconcile the event with this slug (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Event.objects.only("id", "slug", *Event.COUNTER_FIELDS).order_by(
+            "id"
+        )
+        if options["slugs"]:
+            queryset = queryset.filter(slug__in=options["slugs"])
+
+        checked = 0
+        repaired = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    queryset.filter(id__gt=last_id).select_for_update()[:batch_size]
+                )
+                if not batch:
+                    break
+                for event in reconcile_counters(batch):
+                    repaired += 1
+                    self.stdout.write(
+                        f"Repaired {event.slug}: "
+                        f"registered={event.registered_count} "
+                        f"waitlisted={event.waitlisted_count} "
+                        f"cancelled={event.cancelled_count}"
+                    )
+            checked += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} events, repaired {repaired}.")
+        )
@@ -0,0 +1,58 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.exports import claim_next_job, run_export_job
+
+
+class Command(BaseCommand):
+    help = "Process queued roster export jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls when the queue is empty (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = run_export_job(job)
+            if job.status == "completed":
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Export {job.pk} ({job.format}) of {job.event.slug}: "
+                        f"{job.row_count} rows -> {job.file_name}"
+                    )
+                )
+            else:
+                self.stderr.write(f"Export {job.pk} failed: {job.error}")
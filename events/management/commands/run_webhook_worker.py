@@ -0,0 +1,72 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+from importlib.util import find_spec
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Send pending webhook deliveries from the outbox with an asyncio worker "
+        "that keeps many requests in flight at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the deliveries that are due now and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when nothing is due (default: 1).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Deliveries in flight at once (default: WEBHOOK_ASYNC_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--per-host",
+            type=int,
+            help="Deliveries in flight to one host (default: WEBHOOK_PER_HOST_LIMIT).",
+        )
+
+    def handle(self, *args, **options):
+        if find_spec("httpx") is None:
+            raise CommandError(
+                "run_webhook_worker requires the 'httpx' package "
+                "(install the 'webhooks' extra), or use deliver_webhooks."
+            )
+        from events.webhook_async import AsyncWebhookWorker
+
+        worker = AsyncWebhookWorker(
+            concurrency=options["concurrency"], per_host=options["per_host"]
+        )
+        try:
+            asyncio.run(
+                worker.run(once=options["once"], poll_interval=options["poll_interval"])
+            )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            f"Delivered {worker.delivered} webhooks, {worker.failed} failed attempts"
+        )
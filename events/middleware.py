@@ -0,0 +1,163 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Full-page cache for anonymous visitors.
+
+Enabled with ``ANONYMOUS_PAGE_CACHE = True``. The middleware sits in front of
+the session, CSRF, auth, messages and allauth middleware. A GET or HEAD for
+one of ``ANONYMOUS_PAGE_CACHE_VIEWS`` from a visitor with no session or
+messages cookie and no ``Authorization`` header is answered from the server
+cache, without touching the session store or the database. Those pages are
+stored without cookies and marked ``Cache-Control: public, s-maxage=N``, so a
+CDN can share them as well.
+
+Event detail pages are keyed under their event's ``event:<pk>`` cache tag and
+the list pages under the ``events`` tag (see :mod:`events.cache`), so a
+registration only evicts the page of the event it belongs to. The slug to pk
+lookup is cached under the ``events`` tag.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from .cache import EVENTS_TAG, cache_timeout, event_tag, versioned_key
+from .models import Event
+
+DEFAULT_VIEWS = ("home", "event-list", "event-detail")
+# Headers replayed on a hit. Besides the entity headers this covers the
+# security headers that middleware inside this one (clickjacking, CSP) sets,
+# since a hit returns before that middleware runs.
+STORED_HEADERS = (
+    "Content-Type",
+    "Content-Language",
+    "ETag",
+    "Last-Modified",
+    "Vary",
+    "X-Frame-Options",
+    "Content-Security-Policy",
+    "Content-Security-Policy-Report-Only",
+    "Cross-Origin-Opener-Policy",
+    "Referrer-Policy",
+    "X-Content-Type-Options",
+)
+SLUG_CACHE_TIMEOUT = 60 * 60
+
+
+class AnonymousPageCacheMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "ANONYMOUS_PAGE_CACHE", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.views = set(getattr(settings, "ANONYMOUS_PAGE_CACHE_VIEWS", DEFAULT_VIEWS))
+        self.timeout = cache_timeout(
+            getattr(settings, "ANONYMOUS_PAGE_CACHE_TIMEOUT", 300)
+        )
+        self.s_maxage = getattr(settings, "ANONYMOUS_PAGE_CACHE_S_MAXAGE", 60)
+
+    def __call__(self, request):
+        match = self.cacheable_match(request)
+        key = match and self.cache_key(request, match)
+        if not key:
+            return self.get_response(request)
+
+        entry = cache.get(key)
+        if entry is not None:
+            status, headers, content = entry
+            response = get_conditional_response(
+                request, etag=headers.get("ETag")
+            ) or HttpResponse(content, status=status)
+            for header, value in headers.items():
+                response[header] = value
+            return self.mark_public(response)
+
+        response = self.get_response(request)
+        if self.is_cacheable_response(response):
+            headers = {
+                header: response[header]
+                for header in STORED_HEADERS
+                if response.has_header(header)
+            }
+            cache.set(
+                key, (response.status_code, headers, response.content), self.timeout
+            )
+            self.mark_public(response)
+        return response
+
+    def cacheable_match(self, request):
+        """Return the URL match of a cacheable request, or ``None``."""
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if request.META.get("HTTP_AUTHORIZATION"):
+            return None
+        cookies = request.COOKIES
+        if settings.SESSION_COOKIE_NAME in cookies or "messages" in cookies:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        return match if match.url_name in self.views else None
+
+    def is_cacheable_response(self, response):
+        # A page that set a cookie (CSRF token, session) is tied to this
+        # visitor and must not be shared.
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+        )
+
+    def cache_key(self, request, match):
+        """
+        Return the page's key, or ``None`` for a detail page whose slug does
+        not name an event.
+        """
+        slug = match.kwargs.get("slug")
+        if slug is None:
+            tag = EVENTS_TAG
+        else:
+            event_id = self.event_id(slug)
+            if event_id is None:
+                return None
+            tag = event_tag(event_id)
+        digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return versioned_key(f"anonymous-page:{digest}", [tag])
+
+    def event_id(self, slug):
+        # Renaming or deleting an event bumps the ``events`` tag, so a slug
+        # never keeps pointing at the wrong event.
+        key = versioned_key(f"anonymous-page:slug:{slug}", [EVENTS_TAG])
+        event_id = cache.get(key)
+        if event_id is None:
+            event_id = (
+                Event.objects.filter(slug=slug).values_list("pk", flat=True).first()
+            )
+            if event_id is not None:
+                cache.set(key, event_id, cache_timeout(SLUG_CACHE_TIMEOUT))
+        return event_id
+
+    def mark_public(self, response):
+        response["Cache-Control"] = f"public, max-age=0, s-maxage={self.s_maxage}"
+        # Shared caches must not hand this page to a visitor who has a session.
+        patch_vary_headers(response, ["Cookie"])
+        return response
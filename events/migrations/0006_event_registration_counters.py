@@ -0,0 +1,47 @@
+# Generated by Django 6.0 on 2026-10-17 06:17
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    Registration = apps.get_model("events", "Registration")
+
+    totals = {}
+    rows = (
+        Registration.objects.values_list("event_id", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for event_id, status, total in rows:
+        totals.setdefault(event_id, {})[f"{status}_count"] = total
+
+    for event_id, counters in totals.items():
+        Event.objects.filter(pk=event_id).update(**counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_remove_event_webhook_url_webhook'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='cancelled_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='waitlisted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
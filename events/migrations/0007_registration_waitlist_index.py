@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 06:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+import events.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('events', '0006_event_registration_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        events.operations.AddIndexConcurrently(
+            model_name='registration',
+            index=models.Index(fields=['event', 'status', 'registered_at'], name='events_reg_event_status_at_idx'),
+        ),
+    ]
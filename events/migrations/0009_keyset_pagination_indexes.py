@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-17 06:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+import events.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("events", "0008_exportjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        events.operations.AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(fields=["start_time", "id"], name="events_start_id_idx"),
+        ),
+        events.operations.AddIndexConcurrently(
+            model_name="registration",
+            index=models.Index(
+                fields=["event", "registered_at", "id"],
+                name="events_reg_event_at_id_idx",
+            ),
+        ),
+        events.operations.AddIndexConcurrently(
+            model_name="registration",
+            index=models.Index(
+                fields=["participant", "registered_at", "id"],
+                name="events_reg_part_at_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0 on 2026-10-17 09:02
+
+from django.db import DatabaseError, migrations, transaction
+
+# Adding a STORED generated column rewrites events_event under an ACCESS
+# EXCLUSIVE lock: reads and writes wait until every row has been rewritten.
+# On a large table, apply this migration in a maintenance window. The GIN
+# index is then built concurrently, so that part does not block writes.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE events_event ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS events_event_search_idx "
+    "ON events_event USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX CONCURRENTLY IF EXISTS events_event_search_idx",
+    "ALTER TABLE events_event DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE events_event_fts USING fts5(title, location, description)",
+    "INSERT INTO events_event_fts (rowid, title, location, description) "
+    "SELECT id, title, location, description FROM events_event",
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS events_event_fts"]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == "sqlite":
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                for statement in SQLITE_FORWARD:
+                    schema_editor.execute(statement)
+        except DatabaseError:
+            # SQLite built without FTS5; events.search falls back to LIKE.
+            pass
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}
+    for statement in statements.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('events', '0009_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-17 09:40
+
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS events_event_title_trgm_idx "
+    "ON events_event USING GIN (UPPER(title) gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS events_event_location_trgm_idx "
+    "ON events_event USING GIN (UPPER(location) gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX CONCURRENTLY IF EXISTS events_event_location_trgm_idx",
+    "DROP INDEX CONCURRENTLY IF EXISTS events_event_title_trgm_idx",
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Django's istartswith compiles to UPPER(col) LIKE UPPER('prefix%'),
+    # so the indexes are on the UPPER() expression. Other databases use the
+    # in-process prefix index in events.autocomplete.
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_BACKWARD:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('events', '0010_event_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+import events.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('events', '0011_event_autocomplete_trigram_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        events.operations.AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'start_time'], name='events_org_start_idx'),
+        ),
+        events.operations.AddIndexConcurrently(
+            model_name='webhook',
+            index=models.Index(fields=['event', 'is_active'], name='events_webhook_active_idx'),
+        ),
+    ]
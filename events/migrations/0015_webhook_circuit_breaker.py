@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-17 06:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0014_webhook_delivery_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="circuit_open_until",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="webhook",
+            name="circuit_state",
+            field=models.CharField(
+                choices=[
+                    ("closed", "Closed"),
+                    ("open", "Open"),
+                    ("half_open", "Half-open"),
+                ],
+                default="closed",
+                editable=False,
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="webhook",
+            name="consecutive_failures",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="webhook",
+            name="failure_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="webhook",
+            name="success_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="webhookdelivery",
+            name="duration_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 06:58
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0015_webhook_circuit_breaker"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_max_events",
+            field=models.PositiveIntegerField(
+                default=100,
+                help_text="Send a batch early once this many notifications are waiting",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_window_ms",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Collect notifications for this long and send them as one JSON array (0 sends each one on its own)",
+            ),
+        ),
+    ]
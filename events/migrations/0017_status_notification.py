@@ -0,0 +1,48 @@
+# Generated by Django 6.0 on 2026-10-17 07:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0016_webhook_batching"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatusNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("old_status", models.CharField(max_length=20)),
+                ("registration_ids", models.JSONField(default=list)),
+                ("event_url", models.URLField(blank=True, max_length=500)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_notifications",
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["sent_at", "id"], name="events_notification_queue_idx"
+                    )
+                ],
+            },
+        ),
+    ]
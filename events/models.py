@@ -16,6 +16,8 @@
 
 from django.db import models
 from django.conf import settings
+from django.core.validators import MinValueValidator
+from django.utils import timezone
 from django.utils.text import slugify
 from django.db import IntegrityError
 from uuid import uuid4
@@ -34,14 +36,73 @@ class Event(models.Model):
     )
     # Stores a list of questions: [{"id": "q1", "label": "What is your job title?", "type": "text"}]
     registration_schema = models.JSONField(default=list, blank=True)
+    # Denormalized per-status registration counts, maintained by
+    # events.registration and events.signals. Repair drift with
+    # `manage.py reconcile_registration_counters`.
+    registered_count = models.PositiveIntegerField(default=0, editable=False)
+    waitlisted_count = models.PositiveIntegerField(default=0, editable=False)
+    cancelled_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ("registered_count", "waitlisted_count", "cancelled_count")
+    # Fields shown on event lists, the home page and the sitemap; editing one
+    # invalidates every cached listing (see events.cache).
+    LISTING_FIELDS = (
+        "title",
+        "slug",
+        "description",
+        "start_time",
+        "end_time",
+        "location",
+        "organizer_id",
+    )
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the event list (see events.pagination).
+            models.Index(fields=["start_time", "id"], name="events_start_id_idx"),
+            # An organizer's hosted events, soonest first.
+            models.Index(
+                fields=["organizer", "start_time"], name="events_org_start_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def listing_changed(self):
+        """Whether a listing field differs from the row this was loaded from."""
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return True
+        return any(
+            loaded[field] != getattr(self, field)
+            for field in self.LISTING_FIELDS
+            if field in loaded
+        )
+
+    @property
+    def seats_left(self):
+        return max(self.capacity - self.registered_count, 0)
+
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(self.title) or uuid4().hex
             self.slug = base_slug
 
+        # Counters are only ever changed with F() updates; never write back
+        # the (possibly stale) in-memory values on a plain save().
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+
         for attempt in range(5):
             try:
                 return super().save(*args, **kwargs)
@@ -73,15 +134,47 @@ class Registration(models.Model):
     # Stores answers: {"q1": "Software Engineer"}
     answers = models.JSONField(default=dict, blank=True)
     registered_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("event", "participant")
+        indexes = [
+            # Waitlist promotion walks an event's waitlist oldest-first.
+            models.Index(
+                fields=["event", "status", "registered_at"],
+                name="events_reg_event_status_at_idx",
+            ),
+            # Keyset pagination of an event's roster and of a user's own
+            # registrations, newest first (see events.pagination).
+            models.Index(
+                fields=["event", "registered_at", "id"],
+                name="events_reg_event_at_id_idx",
+            ),
+            models.Index(
+                fields=["participant", "registered_at", "id"],
+                name="events_reg_part_at_id_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted status so counter bookkeeping can tell
+        # which bucket a re-saved or deleted registration is leaving.
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
 
     def __str__(self):
         return f"{self.participant} - {self.event.title}"
 
 
 class Webhook(models.Model):
+    CIRCUIT_CHOICES = [
+        ("closed", "Closed"),
+        ("open", "Open"),
+        ("half_open", "Half-open"),
+    ]
+
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="webhooks")
     url = models.URLField(help_text="URL to receive JSON notifications")
     secret = models.CharField(
@@ -89,6 +182,165 @@ class Webhook(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    max_retries = models.PositiveIntegerField(
+        default=8,
+        help_text="Failed deliveries are retried this many times before being dead-lettered",
+    )
+    batch_window_ms = models.PositiveIntegerField(
+        default=0,
+        help_text="Collect notifications for this long and send them as one JSON array (0 sends each one on its own)",
+    )
+    batch_max_events = models.PositiveIntegerField(
+        default=100,
+        validators=[MinValueValidator(1)],
+        help_text="Send a batch early once this many notifications are waiting",
+    )
+    # Delivery health, maintained by events.webhook_utils.record_outcome
+    success_count = models.PositiveIntegerField(default=0, editable=False)
+    failure_count = models.PositiveIntegerField(default=0, editable=False)
+    consecutive_failures = models.PositiveIntegerField(default=0, editable=False)
+    circuit_state = models.CharField(
+        max_length=10,
+        choices=CIRCUIT_CHOICES,
+        default="closed",
+        editable=False,
+    )
+    # While the circuit is open (or a half-open trial is in flight),
+    # deliveries to this webhook are held back until this time.
+    circuit_open_until = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Every registration event looks up the event's active webhooks.
+            models.Index(
+                fields=["event", "is_active"], name="events_webhook_active_idx"
+            ),
+        ]
+
+    @property
+    def success_percent(self):
+        attempts = self.success_count + self.failure_count
+        return round(100 * self.success_count / attempts) if attempts else None
+
+    def reset_circuit(self):
+        """Close the circuit, e.g. after the organizer fixes the URL."""
+        self.consecutive_failures = 0
+        self.circuit_state = "closed"
+        self.circuit_open_until = None
 
     def __str__(self):
         return f"Webhook for {self.event.title} ({self.url})"
+
+
+class WebhookDelivery(models.Model):
+    """
+    One webhook notification in the outbox.
+
+    Rows are written in the same transaction as the registration change they
+    describe and sent later by the ``deliver_webhooks`` worker (see
+    :mod:`events.webhook_utils`).
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("delivered", "Delivered"),
+        ("dead", "Dead"),
+    ]
+
+    webhook = models.ForeignKey(
+        Webhook, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    event_type = models.CharField(max_length=50)
+    # The JSON request body, serialized once when the delivery is recorded
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    # When a pending delivery is next due. Claiming pushes it forward by the
+    # lease, so a worker that dies mid-delivery only delays the retry.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    response_status = models.PositiveIntegerField(null=True, blank=True)
+    # Duration of the latest attempt, in milliseconds
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="events_delivery_queue_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} to {self.webhook.url} ({self.status})"
+
+
+class StatusNotification(models.Model):
+    """
+    Status-changed emails for a batch of registrations, queued in the
+    transaction that changed them and sent by the outbox worker
+    (``manage.py deliver_webhooks``).
+    """
+
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="status_notifications"
+    )
+    old_status = models.CharField(max_length=20)
+    registration_ids = models.JSONField(default=list)
+    # Absolute event URL, resolved from the request that queued the batch
+    event_url = models.URLField(max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["sent_at", "id"], name="events_notification_queue_idx")
+        ]
+
+    def __str__(self):
+        return f"{len(self.registration_ids)} status emails for {self.event}"
+
+
+class ExportJob(models.Model):
+    FORMAT_CHOICES = [
+        ("csv", "CSV"),
+        ("ndjson", "NDJSON"),
+        ("xlsx", "Excel (XLSX)"),
+        ("parquet", "Parquet"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default="csv")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # Name of the finished file in the private storage backend
+    file_name = models.CharField(max_length=255, blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"], name="events_export_queue_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_format_display()} export of {self.event.title} ({self.status})"
+        )
@@ -2,11 +2,14 @@ import json
 
 from django.conf import settings
 from django.contrib.sites.models import Site
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 
+from .models import Registration, StatusNotification
+
 
 def registration_status_label(status: str) -> str:
     if status == "registered":
@@ -92,10 +95,7 @@ def _build_event_url(*, event, request):
     return None
 
 
-def _send_email(*, subject, to_email, text_template, html_template, context):
-    if not to_email:
-        return
-
+def _build_email(*, subject, to_email, text_template, html_template, context):
     text_body = render_to_string(text_template, context).strip()
     html_body = render_to_string(html_template, context)
 
@@ -107,6 +107,20 @@ def _send_email(*, subject, to_email, text_template, html_template, context):
         to=[to_email],
     )
     email.attach_alternative(html_body, "text/html")
+    return email
+
+
+def _send_email(*, subject, to_email, text_template, html_template, context):
+    if not to_email:
+        return
+
+    email = _build_email(
+        subject=subject,
+        to_email=to_email,
+        text_template=text_template,
+        html_template=html_template,
+        context=context,
+    )
     email.send(fail_silently=True)
 
 
@@ -184,17 +198,16 @@ def send_participant_registration_recorded_email(*, registration, request=None):
     )
 
 
-def send_participant_status_changed_email(
-    *, registration, old_status: str, request=None
+def _build_status_changed_email(
+    *, registration, old_status, current_site, request, event_url=None
 ):
     participant_email = getattr(registration.participant, "email", "")
     if not participant_email:
-        return
+        return None
 
     event = registration.event
-    current_site = Site.objects.get_current()
 
-    event_url = _build_event_url(event=event, request=request)
+    event_url = event_url or _build_event_url(event=event, request=request)
     old_status_label = registration_status_label(old_status)
     new_status_label = registration_status_label(registration.status)
 
@@ -212,10 +225,107 @@ def send_participant_status_changed_email(
         "new_status_label": new_status_label,
     }
 
-    _send_email(
+    return _build_email(
         subject=subject,
         to_email=participant_email,
         text_template="events/email/participant_status_changed.txt",
         html_template="events/email/participant_status_changed.html",
         context=context,
     )
+
+
+def send_participant_status_changed_email(
+    *, registration, old_status: str, request=None
+):
+    email = _build_status_changed_email(
+        registration=registration,
+        old_status=old_status,
+        current_site=Site.objects.get_current(),
+        request=request,
+    )
+    if email is not None:
+        email.send(fail_silently=True)
+
+
+def send_participant_status_changed_emails(
+    *, registrations, old_status: str, request=None, event_url=None
+):
+    """
+    Send status-changed emails for many registrations over one connection.
+
+    Returns the number of emails sent.
+    """
+    current_site = Site.objects.get_current()
+    emails = [
+        email
+        for email in (
+            _build_status_changed_email(
+                registration=registration,
+                old_status=old_status,
+                current_site=current_site,
+                request=request,
+                event_url=event_url,
+            )
+            for registration in registrations
+        )
+        if email is not None
+    ]
+    if emails:
+        get_connection(fail_silently=True).send_messages(emails)
+    return len(emails)
+
+
+def queue_participant_status_changed_emails(
+    *, event, registrations, old_status: str, request=None
+):
+    """
+    Queue status-changed emails for ``registrations`` as one
+    :class:`~events.models.StatusNotification`.
+
+    Call this inside the transaction that changed the status; the outbox
+    worker sends them with :func:`send_queued_status_changed_emails`.
+    """
+    if not registrations:
+        return
+    StatusNotification.objects.create(
+        event=event,
+        old_status=old_status,
+        registration_ids=[registration.pk for registration in registrations],
+        event_url=_build_event_url(event=event, request=request) or "",
+    )
+
+
+def send_queued_status_changed_emails(limit=100):
+    """
+    Send up to ``limit`` queued batches of status-changed emails.
+
+    Batches are marked sent before any email goes out, so several workers
+    never send the same batch; a worker that dies mid-batch loses those
+    emails rather than sending them twice. Returns the number of emails sent.
+    """
+    with transaction.atomic():
+        batches = list(
+            StatusNotification.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(sent_at=None)
+            .select_related("event")
+            .order_by("id")[:limit]
+        )
+        StatusNotification.objects.filter(pk__in=[b.pk for b in batches]).update(
+            sent_at=timezone.now()
+        )
+
+    sent = 0
+    for batch in batches:
+        registrations = list(
+            Registration.objects.filter(pk__in=batch.registration_ids).select_related(
+                "participant"
+            )
+        )
+        for registration in registrations:
+            registration.event = batch.event
+        sent += send_participant_status_changed_emails(
+            registrations=registrations,
+            old_status=batch.old_status,
+            event_url=batch.event_url or None,
+        )
+    return sent
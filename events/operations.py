@@ -0,0 +1,61 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Migration operations shared by the ``events`` migrations.
+"""
+
+from django.db import NotSupportedError
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    ``AddIndex`` that builds the index with ``CREATE INDEX CONCURRENTLY`` on
+    PostgreSQL, so it can be applied to a live table without blocking writes.
+
+    Other databases get a plain ``CREATE INDEX``. Migrations using this
+    operation must set ``atomic = False``: PostgreSQL refuses concurrent index
+    builds inside a transaction.
+    """
+
+    def describe(self):
+        return f"Concurrently create index {self.index.name} on {self.model_name}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(
+                model, self.index, **self._concurrently(schema_editor)
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(
+                model, self.index, **self._concurrently(schema_editor)
+            )
+
+    @staticmethod
+    def _concurrently(schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return {}
+        if schema_editor.connection.in_atomic_block:
+            raise NotSupportedError(
+                "AddIndexConcurrently cannot run inside a transaction; "
+                "set atomic = False on the migration."
+            )
+        return {"concurrently": True}
@@ -0,0 +1,210 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Keyset (cursor) pagination for the REST API.
+
+Pages are addressed by the sort key of the row at the page boundary instead of
+an ``OFFSET``, so fetching page 500 costs the same index seek as page one and
+concurrent inserts never shift rows between pages. The sort key is taken from
+the queryset's ``order_by()``; its last field must be unique (``id``) so every
+row has a distinct position.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on the queryset ordering, e.g. ``("-start_time", "-id")``.
+
+    Responses look like ``{"next": url, "previous": url, "results": [...]}``.
+    Each cursor is an opaque, URL-safe token encoding the boundary row's
+    sort key and the direction to read in.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    default_ordering = ("-id",)
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.ordering = tuple(queryset.query.order_by) or self.default_ordering
+
+        position, self.reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            position = self.parse_position(queryset.model, position)
+            queryset = queryset.filter(self._after(ordering, position))
+
+        results = list(queryset[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if self.reverse:
+            results.reverse()
+
+        if self.reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, *, reverse):
+        key = [self._value(instance, field) for field in self.ordering]
+        payload = json.dumps({"k": key, "r": reverse}, cls=DjangoJSONEncoder)
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            key, reverse = payload["k"], bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return key, reverse
+
+    def parse_position(self, model, position):
+        """
+        Convert a decoded sort key to field values, like ``CursorPagination``
+        turning a tampered cursor into a 404 rather than a database error.
+        """
+        try:
+            values = []
+            for field, value in zip(self.ordering, position):
+                if value is None:
+                    raise ValueError("Cursor values cannot be null")
+                model_field = model._meta.get_field(field.lstrip("-"))
+                values.append(model_field.to_python(value))
+        except (FieldDoesNotExist, ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _value(instance, field):
+        value = getattr(instance, field.lstrip("-"))
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _after(ordering, position):
+        """
+        Build the "sorts after ``position``" filter for ``ordering``.
+
+        For ``(-a, -b)`` this is ``a < x OR (a = x AND b < y)``, which the
+        database answers with a single range scan on an ``(a, b)`` index.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
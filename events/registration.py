@@ -0,0 +1,394 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Registration admission engine.
+
+The HTML registration view and the REST ``register`` action both admit
+participants through :func:`admit_registration`, so capacity is enforced in
+exactly one place. Seats are claimed with a conditional ``UPDATE`` on
+``Event.registered_count``; the database row lock taken by that statement is
+what makes the capacity guarantee hold under concurrent load.
+
+Whenever a seat is freed (a registered participant withdraws or is
+cancelled), :func:`promote_waitlisted` fills it from the waitlist in the same
+transaction. Raising an event's capacity promotes too (see
+:mod:`events.signals`), and new registrants are waitlisted while anyone is
+still waiting, so the waitlist stays first come, first served.
+"""
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Now
+
+from .cache import invalidate_event
+from .models import Event, Registration
+from .notifications import (
+    queue_participant_status_changed_emails,
+    send_participant_status_changed_emails,
+)
+from .webhook_utils import (
+    trigger_registration_created_webhooks,
+    trigger_registration_status_changed_webhooks,
+)
+
+# Most registrations one bulk status change may touch, in the API and the
+# roster form alike.
+BULK_STATUS_MAX_IDS = 5000
+
+COUNTER_FIELD_BY_STATUS = {
+    "registered": "registered_count",
+    "waitlisted": "waitlisted_count",
+    "cancelled": "cancelled_count",
+}
+
+
+class AlreadyRegistered(Exception):
+    """Raised when the participant already holds a registration for the event."""
+
+
+class EventFull(Exception):
+    """Raised when a seat is requested for an event with no seats left."""
+
+
+def adjust_counters(event_id, deltas):
+    """
+    Apply ``{status: delta}`` changes to an event's denormalized counters.
+
+    Uses ``F()`` expressions so concurrent adjustments never overwrite each
+    other. ``Event.updated_at`` moves with the counters so HTTP validators
+    (see :mod:`events.conditional`) change whenever seat counts do.
+    """
+    updates = {
+        COUNTER_FIELD_BY_STATUS[status]: F(COUNTER_FIELD_BY_STATUS[status]) + delta
+        for status, delta in deltas.items()
+        if delta and status in COUNTER_FIELD_BY_STATUS
+    }
+    if updates:
+        Event.objects.filter(pk=event_id).update(**updates, updated_at=Now())
+        invalidate_event(event_id)
+
+
+def claim_seats(event_id, seats=1, *, behind_waitlist=False):
+    """
+    Atomically reserve ``seats`` registered places on the event.
+
+    Returns ``True`` when the seats were claimed. The ``WHERE`` clause makes
+    this a compare-and-set: it can only succeed while enough seats remain.
+    With ``behind_waitlist`` it also fails while anyone is waitlisted, so a
+    newcomer never takes a seat ahead of the queue.
+    """
+    events = Event.objects.filter(
+        pk=event_id, registered_count__lte=F("capacity") - seats
+    )
+    if behind_waitlist:
+        events = events.filter(waitlisted_count=0)
+    claimed = events.update(
+        registered_count=F("registered_count") + seats, updated_at=Now()
+    )
+    if claimed:
+        invalidate_event(event_id)
+    return bool(claimed)
+
+
+def admit_registration(*, event, participant, answers=None):
+    """
+    Register ``participant`` for ``event``, waitlisting once the event is full.
+
+    Admission is one short transaction: a conditional ``UPDATE`` claims a seat
+    (or bumps the waitlist counter when none is left, or when others are
+    already waiting for one) and the registration row
+    is inserted, together with the ``registration.created`` webhook outbox
+    rows. There is no ``exists()`` pre-check: the
+    ``(event, participant)`` unique constraint rejects duplicates, the whole
+    transaction (counter included) rolls back, and the conflict is reported
+    as :class:`AlreadyRegistered`.
+    """
+    try:
+        with transaction.atomic():
+            if claim_seats(event.pk, behind_waitlist=True):
+                status_value = "registered"
+            else:
+                status_value = "waitlisted"
+                adjust_counters(event.pk, {"waitlisted": 1})
+
+            registration = Registration(
+                event=event,
+                participant=participant,
+                status=status_value,
+                answers=answers or {},
+            )
+            registration._counters_applied = True
+            registration.save(force_insert=True)
+            trigger_registration_created_webhooks(
+                event=event,
+                registration=registration,
+                participant=participant,
+                answers=registration.answers,
+            )
+    except IntegrityError as exc:
+        raise AlreadyRegistered(
+            f"{participant} is already registered for {event}"
+        ) from exc
+
+    return registration
+
+
+def notify_status_changed(*, event, registrations, old_status, request=None):
+    """
+    Send the status-changed email for a batch of registrations right away.
+
+    Bulk changes and promotions queue theirs instead (see
+    :func:`~events.notifications.queue_participant_status_changed_emails`).
+    The matching webhooks are not sent from here: they are recorded in the
+    outbox inside the transaction that changed the status.
+    """
+    if not registrations:
+        return
+
+    send_participant_status_changed_emails(
+        registrations=registrations, old_status=old_status, request=request
+    )
+
+
+def promote_waitlisted(event_id, *, request=None):
+    """
+    Fill the event's free seats with the oldest waitlisted registrations.
+
+    Promotion is FIFO by ``registered_at`` and is done with a single
+    ``UPDATE``. It joins the caller's transaction when there is one; the
+    participants' emails are queued in it for the outbox worker. Returns the
+    promoted registrations.
+    """
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event_id)
+        free_seats = event.capacity - event.registered_count
+        if free_seats <= 0:
+            return []
+
+        candidate_ids = list(
+            Registration.objects.select_for_update()
+            .filter(event_id=event_id, status="waitlisted")
+            .order_by("registered_at", "id")
+            .values_list("id", flat=True)[:free_seats]
+        )
+        if not candidate_ids:
+            return []
+
+        promoted_count = Registration.objects.filter(
+            pk__in=candidate_ids, status="waitlisted"
+        ).update(status="registered", updated_at=Now())
+        adjust_counters(
+            event_id, {"registered": promoted_count, "waitlisted": -promoted_count}
+        )
+        event.registered_count += promoted_count
+        event.waitlisted_count -= promoted_count
+
+        promoted = list(
+            Registration.objects.filter(pk__in=candidate_ids, status="registered")
+            .select_related("participant")
+            .order_by("registered_at", "id")
+        )
+        for registration in promoted:
+            registration.event = event
+
+        trigger_registration_status_changed_webhooks(
+            event=event, registrations=promoted, old_status="waitlisted"
+        )
+        queue_participant_status_changed_emails(
+            event=event,
+            registrations=promoted,
+            old_status="waitlisted",
+            request=request,
+        )
+
+    return promoted
+
+
+def change_registration_status(registration, new_status, *, request=None):
+    """
+    Move ``registration`` to ``new_status``, keeping the counters in step.
+
+    The row is locked and its status re-read first, so a stale or concurrent
+    request moves the counters from the status actually stored, and does
+    nothing when the registration already has ``new_status``. Raises
+    :class:`EventFull` when approving onto an event with no seats left.
+    Cancelling a registered participant promotes from the waitlist into the
+    freed seat. Returns the previous status.
+    """
+    with transaction.atomic():
+        old_status = (
+            Registration.objects.select_for_update()
+            .values_list("status", flat=True)
+            .get(pk=registration.pk)
+        )
+        registration.status = registration._loaded_status = old_status
+        if new_status == old_status:
+            return old_status
+
+        if new_status == "registered":
+            if not claim_seats(registration.event_id):
+                raise EventFull(f"{registration.event} is at full capacity")
+            adjust_counters(registration.event_id, {old_status: -1})
+        else:
+            adjust_counters(registration.event_id, {old_status: -1, new_status: 1})
+
+        registration.status = new_status
+        registration._counters_applied = True
+        registration.save(update_fields=["status", "updated_at"])
+        trigger_registration_status_changed_webhooks(
+            event=registration.event,
+            registrations=[registration],
+            old_status=old_status,
+        )
+
+        if old_status == "registered" and new_status == "cancelled":
+            promote_waitlisted(registration.event_id, request=request)
+
+    return old_status
+
+
+def bulk_change_status(*, event, registration_ids, new_status, request=None):
+    """
+    Move many of ``event``'s registrations to ``new_status`` at once.
+
+    Capacity is validated once for the whole batch (raising
+    :class:`EventFull` when approving more people than there are free seats),
+    the rows are changed with a single ``UPDATE``, and the emails are queued
+    in the same transaction for the outbox worker to send in batches.
+    Registrations that already have
+    ``new_status`` or belong to another event are ignored. Returns the changed
+    registrations.
+    """
+    with transaction.atomic():
+        locked_event = Event.objects.select_for_update().get(pk=event.pk)
+        rows = list(
+            Registration.objects.select_for_update()
+            .filter(event_id=event.pk, pk__in=registration_ids)
+            .exclude(status=new_status)
+            .values_list("id", "status")
+        )
+        if not rows:
+            return []
+
+        changed_ids = [registration_id for registration_id, _ in rows]
+        old_status_by_id = dict(rows)
+        leaving = Counter(old_status_by_id.values())
+
+        if new_status == "registered" and len(rows) > locked_event.seats_left:
+            raise EventFull(
+                f"{locked_event} has {locked_event.seats_left} seats left, "
+                f"{len(rows)} requested"
+            )
+
+        Registration.objects.filter(pk__in=changed_ids).update(
+            status=new_status, updated_at=Now()
+        )
+        deltas = {status_value: -count for status_value, count in leaving.items()}
+        deltas[new_status] = deltas.get(new_status, 0) + len(rows)
+        adjust_counters(event.pk, deltas)
+
+        changed = list(
+            Registration.objects.filter(pk__in=changed_ids).select_related(
+                "participant"
+            )
+        )
+        by_old_status = {}
+        for registration in changed:
+            registration.event = event
+            by_old_status.setdefault(old_status_by_id[registration.pk], []).append(
+                registration
+            )
+
+        for old_status, registrations in by_old_status.items():
+            trigger_registration_status_changed_webhooks(
+                event=event, registrations=registrations, old_status=old_status
+            )
+            queue_participant_status_changed_emails(
+                event=event,
+                registrations=registrations,
+                old_status=old_status,
+                request=request,
+            )
+
+        if new_status == "cancelled" and leaving.get("registered"):
+            promote_waitlisted(event.pk, request=request)
+
+    return changed
+
+
+def withdraw_registration(registration, *, request=None):
+    """
+    Delete ``registration`` and hand its seat to the waitlist.
+
+    The row is locked and its status re-read first, so the counters move
+    from the status actually stored even when ``registration`` is stale.
+    Returns ``False`` when the registration had already been removed.
+    """
+    with transaction.atomic():
+        status_value = (
+            Registration.objects.select_for_update()
+            .filter(pk=registration.pk)
+            .values_list("status", flat=True)
+            .first()
+        )
+        if status_value is None:
+            return False
+        registration.status = registration._loaded_status = status_value
+        registration._counters_applied = True
+        registration.delete()
+
+        adjust_counters(registration.event_id, {status_value: -1})
+        if status_value == "registered":
+            promote_waitlisted(registration.event_id, request=request)
+
+    return True
+
+
+def reconcile_counters(events):
+    """
+    Recompute the counters of ``events`` from the registration table.
+
+    Returns the list of events whose stored counters had drifted; those rows
+    are rewritten with the recomputed values.
+    """
+    events = list(events)
+    totals = {event.pk: Counter() for event in events}
+    rows = (
+        Registration.objects.filter(event_id__in=totals)
+        .values_list("event_id", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for event_id, status_value, total in rows:
+        totals[event_id][status_value] = total
+
+    repaired = []
+    for event in events:
+        expected = {
+            field: totals[event.pk][status_value]
+            for status_value, field in COUNTER_FIELD_BY_STATUS.items()
+        }
+        if any(getattr(event, field) != value for field, value in expected.items()):
+            Event.objects.filter(pk=event.pk).update(**expected, updated_at=Now())
+            invalidate_event(event.pk)
+            for field, value in expected.items():
+                setattr(event, field, value)
+            repaired.append(event)
+
+    return repaired
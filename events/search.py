@@ -0,0 +1,149 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Full-text search over events.
+
+:func:`get_search_backend` picks an implementation for the active database:
+
+* PostgreSQL: a stored, generated ``tsvector`` column with a GIN index
+  (created by migration ``0010``); the database keeps it current on every
+  write and ranks with ``ts_rank``.
+* SQLite: an FTS5 table keyed by event id, kept in sync from ``Event``'s
+  ``post_save`` / ``post_delete`` signals and ranked with ``bm25``.
+* Anything else (or SQLite built without FTS5): ``icontains`` matching.
+
+Every term in the query is matched as a prefix, so results stay useful while
+the user is still typing. Title matches rank above location matches, which
+rank above description matches. ``manage.py rebuild_search_index``
+repopulates an index after bulk writes that bypass ``save()``.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = "events_event_fts"
+WORD_RE = re.compile(r"\w+")
+
+
+def search_terms(query):
+    return WORD_RE.findall(query or "")
+
+
+class SearchBackend:
+    """Fallback backend: substring matching on title and description."""
+
+    def search(self, queryset, query):
+        """Filter ``queryset`` to events matching ``query``, best match first."""
+        for term in search_terms(query):
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+
+    def index(self, event):
+        """Add or refresh ``event`` in the index."""
+
+    def remove(self, event_id):
+        """Drop the event with ``event_id`` from the index."""
+
+    def rebuild(self):
+        """Re-index every event; returns the number of indexed events."""
+        return 0
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Ranked search on the generated ``events_event.search_vector`` column."""
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return queryset.extra(
+            select={
+                "search_rank": "ts_rank(events_event.search_vector, "
+                "to_tsquery('english', %s))"
+            },
+            select_params=[tsquery],
+            where=["events_event.search_vector @@ to_tsquery('english', %s)"],
+            params=[tsquery],
+            order_by=["-search_rank", "start_time"],
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Ranked search on the ``events_event_fts`` FTS5 table."""
+
+    # bm25() column weights for (title, location, description).
+    weights = (10.0, 5.0, 1.0)
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in self.weights)
+        return queryset.extra(
+            select={"search_rank": f"bm25({FTS_TABLE}, {weights})"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = events_event.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+            # bm25() scores are negative; the best match sorts first.
+            order_by=["search_rank", "start_time"],
+        )
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [event.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, location, description) "
+                "VALUES (%s, %s, %s, %s)",
+                [event.pk, event.title, event.location, event.description],
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [event_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, location, description) "
+                "SELECT id, title, location, description FROM events_event"
+            )
+            cursor.execute("SELECT COUNT(*) FROM events_event")
+            return cursor.fetchone()[0]
+
+
+_fts_available = {}
+
+
+def get_search_backend():
+    """Return the search backend for the default database connection."""
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    if connection.vendor == "sqlite":
+        # The FTS5 table is only created when SQLite was built with FTS5.
+        name = connection.settings_dict["NAME"]
+        if name not in _fts_available:
+            _fts_available[name] = FTS_TABLE in connection.introspection.table_names()
+        if _fts_available[name]:
+            return SQLiteSearchBackend()
+    return SearchBackend()
@@ -14,22 +14,134 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from .loaders import get_loaders, load_related
 from .models import Event, Registration
+from .registration import BULK_STATUS_MAX_IDS
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class BatchListSerializer(serializers.ListSerializer):
+    """Primes the request's batch loaders with the whole page before rendering."""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, "all") else data)
+        self.child.prime(items)
+        return super().to_representation(items)
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients choose the fields they receive.
+
+    ``?fields=id,title,organizer.username`` keeps only the named fields (dotted
+    names reach into nested serializers), ``?omit=description`` drops fields,
+    and names listed in ``Meta.expandable_fields`` are left out unless asked
+    for with ``?expand=``. :meth:`narrow_queryset` loads only the columns the
+    remaining fields read. ``fields`` and ``omit`` only apply to reads; a
+    write always validates and saves every writable field.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None:
+            return fields
+
+        params = request.query_params
+        prefix = self._field_path()
+        selected, omitted = [], set()
+        if request.method in SAFE_METHODS:
+            selected = [
+                name[len(prefix) :]
+                for name in _split_param(params.get("fields"))
+                if name.startswith(prefix)
+            ]
+            omitted = {
+                name[len(prefix) :]
+                for name in _split_param(params.get("omit"))
+                if name.startswith(prefix)
+            }
+        expanded = set(_split_param(params.get("expand")))
+
+        keep = {name.split(".", 1)[0] for name in selected} or set(fields)
+        for field_name in getattr(self.Meta, "expandable_fields", []):
+            if prefix + field_name not in expanded:
+                keep.discard(field_name)
+        return {
+            name: field
+            for name, field in fields.items()
+            if name in keep and name not in omitted
+        }
+
+    def _field_path(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return "".join(f"{name}." for name in reversed(names))
+
+    def narrow_queryset(self, queryset, extra=()):
+        """
+        Restrict ``queryset`` with ``only()`` to the columns the fields use.
+
+        ``Meta.field_sources`` names the model fields behind computed fields;
+        when a kept field cannot be mapped to the model the queryset is
+        returned unchanged. Model fields named in ``extra`` (such as the
+        view's ETag fields) are always loaded.
+        """
+        opts = queryset.model._meta
+        sources = getattr(self.Meta, "field_sources", {})
+        model_fields = {field.name for field in opts.concrete_fields}
+        # Keep the sort key loaded too: the paginator reads it for cursors.
+        columns = {opts.pk.name}
+        columns.update(name.lstrip("-") for name in queryset.query.order_by)
+        columns.update(name for name in extra if name in model_fields)
+        for name, field in self.fields.items():
+            if name in sources:
+                columns.update(sources[name])
+                continue
+            try:
+                model_field = opts.get_field(field.source.split(".", 1)[0])
+            except FieldDoesNotExist:
+                return queryset
+            if not model_field.concrete:
+                return queryset
+            columns.add(model_field.name)
+        return queryset.only(*columns)
+
+
+def _split_param(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email", "first_name", "last_name"]
 
 
-class EventSerializer(serializers.ModelSerializer):
-    organizer = UserSerializer(read_only=True)
+class LoadedUserSerializer(UserSerializer):
+    """Read-only nested user resolved through the request's user loader."""
+
+    def get_attribute(self, instance):
+        return load_related(instance, self.source, get_loaders(self.context).users)
+
+
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    organizer = LoadedUserSerializer(read_only=True)
     registration_schema = serializers.JSONField(read_only=True)
+    registrations = serializers.SerializerMethodField()
+    registrations_url = serializers.HyperlinkedIdentityField(
+        view_name="api-events-registrations"
+    )
+    seats_left = serializers.IntegerField(read_only=True)
     is_registered = serializers.SerializerMethodField()
 
     class Meta:
@@ -44,6 +156,10 @@ class EventSerializer(serializers.ModelSerializer):
             "capacity",
             "organizer",
             "registration_schema",
+            "registered_count",
+            "waitlisted_count",
+            "seats_left",
+            "registrations_url",
             "registrations",
             "created_at",
             "updated_at",
@@ -51,19 +167,39 @@ class EventSerializer(serializers.ModelSerializer):
             "slug",
         ]
         read_only_fields = ["organizer", "created_at", "updated_at", "slug"]
+        list_serializer_class = BatchListSerializer
+        expandable_fields = ["registrations"]
+        field_sources = {
+            "registrations": [],
+            "registrations_url": [],
+            "seats_left": ["capacity", "registered_count"],
+            "is_registered": [],
+        }
+
+    def prime(self, events):
+        loaders = get_loaders(self.context)
+        event_ids = [event.pk for event in events]
+        if "organizer" in self.fields:
+            loaders.users.enqueue(
+                event.organizer_id
+                for event in events
+                if not Event.organizer.is_cached(event)
+            )
+        if "registrations" in self.fields:
+            loaders.registration_ids.enqueue(event_ids)
+        if "is_registered" in self.fields:
+            loaders.is_registered.enqueue(event_ids)
+
+    def get_registrations(self, obj):
+        return get_loaders(self.context).registration_ids.load(obj.pk) or []
 
     def get_is_registered(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return Registration.objects.filter(
-                event=obj, participant=request.user
-            ).exists()
-        return False
+        return bool(get_loaders(self.context).is_registered.load(obj.pk))
 
 
-class RegistrationSerializer(serializers.ModelSerializer):
-    event_title = serializers.ReadOnlyField(source="event.title")
-    participant_info = UserSerializer(source="participant", read_only=True)
+class RegistrationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    event_title = serializers.SerializerMethodField()
+    participant_info = LoadedUserSerializer(source="participant", read_only=True)
     answers = serializers.JSONField(read_only=True)
 
     class Meta:
@@ -78,3 +214,33 @@ class RegistrationSerializer(serializers.ModelSerializer):
             "answers",
         ]
         read_only_fields = ["participant", "status", "registered_at", "event"]
+        list_serializer_class = BatchListSerializer
+        field_sources = {"event_title": ["event"]}
+
+    def prime(self, registrations):
+        loaders = get_loaders(self.context)
+        if "event_title" in self.fields:
+            loaders.events.enqueue(
+                registration.event_id
+                for registration in registrations
+                if not Registration.event.is_cached(registration)
+            )
+        if "participant_info" in self.fields:
+            loaders.users.enqueue(
+                registration.participant_id
+                for registration in registrations
+                if not Registration.participant.is_cached(registration)
+            )
+
+    def get_event_title(self, obj):
+        event = load_related(obj, "event", get_loaders(self.context).events)
+        return event.title if event is not None else None
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_STATUS_MAX_IDS,
+    )
+    status = serializers.ChoiceField(choices=Registration.STATUS_CHOICES)
@@ -0,0 +1,86 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import get_suggester
+from .cache import invalidate_event
+from .models import Event, Registration
+from .registration import adjust_counters, promote_waitlisted
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Registration)
+def sync_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    # Saves made through events.registration already moved the counters
+    # inside their own transaction; everything else (admin, shell, fixtures
+    # aside) is reconciled here.
+    if raw:
+        return
+
+    if getattr(instance, "_counters_applied", False):
+        instance._counters_applied = False
+    elif created:
+        adjust_counters(instance.event_id, {instance.status: 1})
+    else:
+        old_status = getattr(instance, "_loaded_status", None)
+        if old_status and old_status != instance.status:
+            adjust_counters(instance.event_id, {old_status: -1, instance.status: 1})
+
+    instance._loaded_status = instance.status
+    invalidate_event(instance.event_id)
+
+
+@receiver(post_delete, sender=Registration)
+def sync_counters_on_delete(sender, instance, origin=None, **kwargs):
+    if getattr(instance, "_counters_applied", False):
+        return
+    # Cascading from an event delete: the counters go with the event.
+    if isinstance(origin, Event) or getattr(origin, "model", None) is Event:
+        return
+
+    status_value = getattr(instance, "_loaded_status", None) or instance.status
+    adjust_counters(instance.event_id, {status_value: -1})
+
+
+@receiver(post_save, sender=Event)
+def promote_on_capacity_increase(sender, instance, created, raw=False, **kwargs):
+    # Runs before index_event_on_save, which refreshes _loaded_values.
+    loaded = getattr(instance, "_loaded_values", None)
+    if raw or created or loaded is None or "capacity" not in loaded:
+        return
+    if instance.capacity > loaded["capacity"]:
+        promote_waitlisted(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+def index_event_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index(instance)
+        get_suggester().invalidate()
+        invalidate_event(instance.pk, listing=created or instance.listing_changed())
+        instance._loaded_values = {
+            field.attname: getattr(instance, field.attname)
+            for field in instance._meta.concrete_fields
+        }
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event_on_delete(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+    get_suggester().invalidate()
+    invalidate_event(instance.pk, listing=True)
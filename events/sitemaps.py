@@ -17,12 +17,35 @@
 """
 Sitemap configuration for Event Horizon
 Defines XML sitemaps for search engine indexing
+
+``/sitemap.xml`` is a sitemap index pointing at one child sitemap per
+section, each split into pages of at most ``limit`` URLs (``?p=2`` ...).
+Rendered XML is cached by :func:`cached_sitemap` under a key that includes
+the latest upcoming ``Event.updated_at``, so a cached ``<lastmod>`` is never
+stale, and under the ``events`` cache tag, which also catches deletes.
+Crawlers are served from cache, at the cost of one aggregate query, until the
+catalog actually changes.
 """
 
+from functools import wraps
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.db.models import Max
+from django.http import HttpResponse
 from django.urls import reverse
+from django.utils import timezone
+
+from events.cache import EVENTS_TAG, get_or_set
 from events.models import Event
-from django.contrib.auth.models import User
+
+
+def upcoming_events():
+    return Event.objects.filter(start_time__gte=timezone.now())
+
+
+def latest_event_update():
+    return upcoming_events().aggregate(latest=Max("updated_at"))["latest"]
 
 
 class StaticViewSitemap(Sitemap):
@@ -37,23 +60,73 @@ class StaticViewSitemap(Sitemap):
     def location(self, item):
         return reverse(item)
 
+    def lastmod(self, item):
+        # Both pages list upcoming events.
+        return latest_event_update()
+
 
 class EventSitemap(Sitemap):
     """Sitemap for event pages"""
 
     changefreq = "daily"
     priority = 0.9
+    # Well under the protocol's 50,000 URL limit, so each page stays small.
+    limit = 5000
 
     def items(self):
-        # Only include upcoming events in sitemap
-        from django.utils import timezone
-
-        return Event.objects.filter(start_time__gte=timezone.now()).order_by(
-            "-created_at"
-        )
+        # Only include upcoming events in sitemap. Ordering by id keeps the
+        # page boundaries stable while events are added.
+        return upcoming_events().only("id", "slug", "updated_at").order_by("id")
 
     def lastmod(self, item):
         return item.updated_at
 
+    def get_latest_lastmod(self):
+        # The default iterates over every item; one aggregate is enough.
+        return latest_event_update()
+
     def location(self, item):
         return reverse("event-detail", args=[item.slug])
+
+
+def cached_sitemap(view):
+    """
+    Cache a sitemap view's rendered XML per section and page.
+
+    The key is built from the section and ``?p=`` only, so other query
+    strings cannot add cache entries.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        def build():
+            response = view(request, *args, **kwargs)
+            response.render()
+            return response.content, response["Content-Type"], dict(response.items())
+
+        page = request.GET.get("p", "1")
+        if page.isdigit():
+            page = int(page)
+        latest = latest_event_update()
+        key = ":".join(
+            [
+                "sitemap",
+                request.scheme,
+                request.get_host(),
+                kwargs.get("section", "index"),
+                str(page),
+                str(latest.timestamp() if latest else 0),
+            ]
+        )
+        content, content_type, headers = get_or_set(
+            key,
+            build,
+            tags=[EVENTS_TAG],
+            timeout=getattr(settings, "SITEMAP_CACHE_TIMEOUT", 3600),
+        )
+        response = HttpResponse(content, content_type=content_type)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    return wrapped
@@ -14,16 +14,50 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import base64
+import hashlib
+import hmac
+import json
+import tempfile
+import threading
 from datetime import timedelta
+from importlib.util import find_spec
+from io import StringIO
+from unittest import mock, skipUnless
 
+import requests
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
 from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 
-from .models import Event, Registration
+from .cache import (
+    EVENTS_TAG,
+    LOCAL_CACHE_TIMEOUT,
+    cache_timeout,
+    event_tag,
+    tag_versions,
+    upcoming_events,
+)
+from .autocomplete import get_suggester, suggest
+from .exports import available_formats
+from .models import Event, ExportJob, Registration, Webhook, WebhookDelivery
+from .sitemaps import EventSitemap
+from .registration import (
+    AlreadyRegistered,
+    admit_registration,
+    change_registration_status,
+    withdraw_registration,
+)
+from .webhook_utils import WebhookDispatcher, deliver_due, record_deliveries
 
 User = get_user_model()
 
@@ -158,3 +192,945 @@ class EventTests(TestCase):
 
         registration = Registration.objects.get(event=event, participant=self.user)
         self.assertEqual(registration.status, "waitlisted")
+
+    def test_admission_never_exceeds_capacity(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 2}
+        )
+        participants = [
+            User.objects.create_user(username=f"crew{i}", password="password")
+            for i in range(4)
+        ]
+
+        statuses = [
+            admit_registration(event=event, participant=participant).status
+            for participant in participants
+        ]
+
+        self.assertEqual(
+            statuses, ["registered", "registered", "waitlisted", "waitlisted"]
+        )
+        self.assertEqual(
+            Registration.objects.filter(event=event, status="registered").count(), 2
+        )
+
+    def test_duplicate_registration_is_rejected(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        admit_registration(event=event, participant=self.user)
+
+        with self.assertRaises(AlreadyRegistered):
+            admit_registration(event=event, participant=self.user)
+
+        response = self.api_client.post(
+            reverse("api-events-register", kwargs={"pk": event.pk}),
+            data={"answers": {}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            Registration.objects.filter(event=event, participant=self.user).count(), 1
+        )
+
+    def test_registration_counters_follow_status_changes(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 1}
+        )
+        admit_registration(event=event, participant=self.organizer)
+        waitlisted = admit_registration(event=event, participant=self.user)
+
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.waitlisted_count), (1, 1))
+        self.assertEqual(event.seats_left, 0)
+
+        self.client.logout()
+        self.client.login(username="organizer", password="password")
+        self.client.post(
+            reverse("manage-registration", kwargs={"registration_id": waitlisted.id}),
+            {"action": "cancel"},
+        )
+        Registration.objects.get(event=event, participant=self.organizer).delete()
+
+        event.refresh_from_db()
+        self.assertEqual(
+            (event.registered_count, event.waitlisted_count, event.cancelled_count),
+            (0, 0, 1),
+        )
+
+    def test_stale_status_changes_move_counters_once(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        registration = admit_registration(event=event, participant=self.user)
+        change_registration_status(registration, "waitlisted")
+        first, second = (Registration.objects.get(pk=registration.pk) for _ in "ab")
+
+        self.assertEqual(change_registration_status(first, "registered"), "waitlisted")
+        self.assertEqual(change_registration_status(second, "registered"), "registered")
+
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.waitlisted_count), (1, 0))
+
+        # Cancelled by the organizer while the participant holds the old row.
+        change_registration_status(second, "cancelled")
+        self.assertTrue(withdraw_registration(first))
+        event.refresh_from_db()
+        self.assertEqual(
+            (event.registered_count, event.cancelled_count, event.seats_left),
+            (0, 0, event.capacity),
+        )
+
+    def test_reconcile_command_repairs_drifted_counters(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        Registration.objects.create(
+            event=event, participant=self.user, status="registered"
+        )
+        Event.objects.filter(pk=event.pk).update(registered_count=7, waitlisted_count=3)
+
+        call_command("reconcile_registration_counters", stdout=StringIO())
+
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.waitlisted_count), (1, 0))
+
+        # Deleting the event leaves the counters alone, even drifted ones.
+        Event.objects.filter(pk=event.pk).update(registered_count=0)
+        with CaptureQueriesContext(connection) as queries:
+            event.delete()
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith('UPDATE "events_event"')]
+        )
+        self.assertFalse(Registration.objects.filter(event_id=event.pk).exists())
+
+    def test_withdrawal_promotes_oldest_waitlisted(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 1}
+        )
+        admit_registration(event=event, participant=self.user)
+        first = User.objects.create_user(
+            username="first", password="password", email="first@example.com"
+        )
+        second = User.objects.create_user(username="second", password="password")
+        admit_registration(event=event, participant=first)
+        admit_registration(event=event, participant=second)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("event-unregister", kwargs={"slug": event.slug})
+            )
+        self.assertEqual(response.status_code, 302)
+
+        statuses = dict(
+            Registration.objects.filter(event=event).values_list(
+                "participant__username", "status"
+            )
+        )
+        self.assertEqual(statuses, {"first": "registered", "second": "waitlisted"})
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.waitlisted_count), (1, 1))
+
+        # The promotion email is queued for the outbox worker.
+        self.assertEqual(mail.outbox, [])
+        call_command("deliver_webhooks", "--once", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["first@example.com"])
+        self.assertIn(f"/events/{event.slug}/", mail.outbox[0].body)
+
+    def test_capacity_increase_promotes_before_newcomers(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 1}
+        )
+        admit_registration(event=event, participant=self.organizer)
+        waiting = admit_registration(event=event, participant=self.user)
+        # A seat freed without promotion must still not go to a newcomer.
+        Event.objects.filter(pk=event.pk).update(capacity=2)
+        newcomer = User.objects.create_user(username="newcomer", password="password")
+        self.assertEqual(
+            admit_registration(event=event, participant=newcomer).status, "waitlisted"
+        )
+
+        event = Event.objects.get(pk=event.pk)
+        event.capacity = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        statuses = dict(
+            Registration.objects.filter(event=event).values_list("pk", "status")
+        )
+        self.assertEqual(statuses[waiting.pk], "registered")
+        self.assertEqual(set(statuses.values()), {"registered"})
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.waitlisted_count), (3, 0))
+
+    def test_organizer_cancel_promotes_waitlisted(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 1}
+        )
+        seated = admit_registration(event=event, participant=self.organizer)
+        admit_registration(event=event, participant=self.user)
+
+        self.client.logout()
+        self.client.login(username="organizer", password="password")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("manage-registration", kwargs={"registration_id": seated.id}),
+                {"action": "cancel"},
+            )
+
+        promoted = Registration.objects.get(event=event, participant=self.user)
+        self.assertEqual(promoted.status, "registered")
+
+    def test_bulk_approve_respects_capacity(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 2}
+        )
+        waitlisted = [
+            Registration.objects.create(
+                event=event,
+                participant=User.objects.create_user(
+                    username=f"standby{i}", password="password"
+                ),
+                status="waitlisted",
+            )
+            for i in range(3)
+        ]
+
+        self.client.logout()
+        self.client.login(username="organizer", password="password")
+        bulk_url = reverse("registration-bulk-manage", kwargs={"slug": event.slug})
+        with (
+            mock.patch("events.views.BULK_STATUS_MAX_IDS", 2),
+            mock.patch("events.views.bulk_change_status") as bulk,
+        ):
+            self.client.post(
+                bulk_url,
+                {"action": "cancel", "registration_ids": [r.id for r in waitlisted]},
+            )
+        bulk.assert_not_called()
+        # An id from another event is ignored, not counted as requested.
+        response = self.client.post(
+            bulk_url,
+            {
+                "action": "approve",
+                "registration_ids": [r.id for r in waitlisted] + [99999],
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        message = list(get_messages(response.wsgi_request))[-1]
+        self.assertIn("2 seats left, 3 requested", str(message))
+        self.assertFalse(
+            Registration.objects.filter(event=event, status="registered").exists()
+        )
+
+        Webhook.objects.create(event=event, url="https://hooks.example.com/bulk")
+        self.api_client.force_authenticate(user=self.organizer)
+        with (
+            self.captureOnCommitCallbacks(execute=True),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            response = self.api_client.post(
+                reverse(
+                    "api-events-registrations-bulk-status", kwargs={"pk": event.pk}
+                ),
+                data={"ids": [r.id for r in waitlisted[:2]], "status": "registered"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(response.data["updated"], [r.id for r in waitlisted[:2]])
+        outbox_inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "events_webhookdelivery"')
+        ]
+        self.assertEqual(len(outbox_inserts), 1)
+        self.assertEqual(WebhookDelivery.objects.count(), 2)
+
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.waitlisted_count), (2, 1))
+
+    def test_export_streams_roster_csv(self):
+        event = Event.objects.create(
+            organizer=self.organizer,
+            **self.event_data,
+            registration_schema=[{"id": "q1", "label": "Veteran?", "type": "checkbox"}],
+        )
+        Registration.objects.create(
+            event=event, participant=self.user, answers={"q1": True}
+        )
+
+        self.client.logout()
+        self.client.login(username="organizer", password="password")
+        response = self.client.get(reverse("event-export", kwargs={"slug": event.slug}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "Username,Email,Status,Registered At,Veteran?")
+        self.assertTrue(
+            lines[1].startswith("testuser,testuser@example.com,registered,")
+        )
+        self.assertTrue(lines[1].endswith(",Yes"))
+
+    def test_background_export_job_lifecycle(self):
+        event = Event.objects.create(
+            organizer=self.organizer,
+            **self.event_data,
+            registration_schema=[
+                {"id": "q1", "label": "Role", "type": "text"},
+                {"id": "q2", "label": "Role", "type": "text"},
+                {"id": "q3", "label": "Email", "type": "text"},
+            ],
+        )
+        Registration.objects.create(
+            event=event,
+            participant=self.user,
+            answers={"q1": "Pilot", "q2": "Navigator", "q3": "ops@example.com"},
+        )
+
+        self.client.logout()
+        self.client.login(username="organizer", password="password")
+        self.client.post(
+            reverse("export-job-create", kwargs={"slug": event.slug}),
+            {"format": "ndjson"},
+        )
+        for export_format in available_formats():
+            ExportJob.objects.create(
+                event=event, requested_by=self.organizer, format=export_format
+            )
+        # Left running by a worker that died two hours ago.
+        ExportJob.objects.create(
+            event=event,
+            requested_by=self.organizer,
+            status="running",
+            started_at=timezone.now() - timedelta(hours=2),
+        )
+
+        with tempfile.TemporaryDirectory() as private_root:
+            with self.settings(PRIVATE_MEDIA_ROOT=private_root):
+                call_command("run_export_jobs", "--once", stdout=StringIO())
+
+                self.assertFalse(ExportJob.objects.exclude(status="completed").exists())
+                job = ExportJob.objects.filter(format="ndjson").earliest("pk")
+                response = self.client.get(
+                    reverse("export-job-download", kwargs={"pk": job.pk})
+                )
+                content = b"".join(response.streaming_content)
+                response.close()
+
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(content.decode().splitlines()[0])
+        self.assertEqual(record["Username"], "testuser")
+        self.assertEqual(record["Role"], "Pilot")
+        self.assertEqual(record["Role (q2)"], "Navigator")
+        self.assertEqual(record["Email"], "testuser@example.com")
+        self.assertEqual(record["Email (q3)"], "ops@example.com")
+
+    def test_api_event_list_is_keyset_paginated(self):
+        start = timezone.now() + timedelta(days=1)
+        for i in range(5):
+            # Pairs of events share a start time, so ties are broken on id.
+            Event.objects.create(
+                organizer=self.organizer,
+                **{
+                    **self.event_data,
+                    "title": f"Event {i}",
+                    "start_time": start + timedelta(hours=i // 2),
+                },
+            )
+        expected = list(
+            Event.objects.order_by("-start_time", "-id").values_list("id", flat=True)
+        )
+
+        seen = []
+        url = reverse("api-events-list") + "?page_size=2"
+        while url:
+            response = self.api_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(event["id"] for event in response.data["results"])
+            last_page, url = response.data, response.data["next"]
+        self.assertEqual(seen, expected)
+
+        previous = self.api_client.get(last_page["previous"])
+        self.assertEqual(
+            [event["id"] for event in previous.data["results"]], expected[2:4]
+        )
+        tampered = base64.urlsafe_b64encode(b'{"k": ["soon", 1], "r": false}')
+        for cursor in ("bogus", tampered.decode()):
+            self.assertEqual(
+                self.api_client.get(
+                    reverse("api-events-list"), {"cursor": cursor}
+                ).status_code,
+                404,
+            )
+
+    def test_api_event_list_query_count_is_independent_of_page_size(self):
+        for i in range(6):
+            organizer = User.objects.create_user(username=f"host{i}", password="pw")
+            event = Event.objects.create(
+                organizer=organizer, **{**self.event_data, "title": f"Event {i}"}
+            )
+            if i % 2:
+                admit_registration(event=event, participant=self.user)
+
+        def count_queries(page_size):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.api_client.get(
+                    reverse("api-events-list") + f"?page_size={page_size}"
+                )
+            self.assertEqual(len(response.data["results"]), page_size)
+            return len(queries), response.data["results"]
+
+        small, _ = count_queries(2)
+        large, results = count_queries(6)
+        self.assertEqual(small, large)
+        self.assertEqual(sum(event["is_registered"] for event in results), 3)
+        self.assertTrue(all(event["organizer"]["username"] for event in results))
+
+    def test_api_event_carries_counts_and_expands_registrations_on_request(self):
+        event = Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "capacity": 1}
+        )
+        seated = admit_registration(event=event, participant=self.user)
+        admit_registration(event=event, participant=self.organizer)
+
+        data = self.api_client.get(reverse("api-events-list")).data["results"][0]
+        self.assertNotIn("registrations", data)
+        self.assertEqual(
+            (data["registered_count"], data["waitlisted_count"], data["seats_left"]),
+            (1, 1, 0),
+        )
+        self.assertTrue(
+            data["registrations_url"].endswith(
+                reverse("api-events-registrations", args=[event.pk])
+            )
+        )
+
+        expanded = self.api_client.get(
+            reverse("api-events-detail", args=[event.pk]) + "?expand=registrations"
+        ).data
+        self.assertIn(seated.pk, expanded["registrations"])
+
+    def test_api_sparse_fieldsets_narrow_response_and_query(self):
+        Event.objects.create(organizer=self.organizer, **self.event_data)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api_client.get(
+                reverse("api-events-list") + "?fields=id,title,organizer.username"
+            )
+        data = response.data["results"][0]
+        self.assertEqual(set(data), {"id", "title", "organizer"})
+        self.assertEqual(data["organizer"], {"username": "organizer"})
+        event_query = next(q["sql"] for q in queries if "events_event" in q["sql"])
+        self.assertNotIn("description", event_query)
+
+        data = self.api_client.get(
+            reverse("api-events-list") + "?omit=description,organizer"
+        ).data["results"][0]
+        self.assertNotIn("description", data)
+        self.assertNotIn("organizer", data)
+        self.assertIn("seats_left", data)
+
+        created = self.api_client.post(
+            reverse("api-events-list") + "?fields=id",
+            {**self.event_data, "title": "Written Launch"},
+            format="json",
+        )
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(created.data["title"], "Written Launch")
+
+    def test_event_search_ranks_title_matches_and_follows_edits(self):
+        description_hit = Event.objects.create(
+            organizer=self.organizer,
+            **{**self.event_data, "title": "Orbital Mixer"},
+        )
+        description_hit.description = "Bring your quantum questions"
+        description_hit.save()
+        title_hit = Event.objects.create(
+            organizer=self.organizer,
+            **{**self.event_data, "title": "Quantum Computing Summit"},
+        )
+        Event.objects.create(
+            organizer=self.organizer, **{**self.event_data, "title": "Star Gazing"}
+        )
+
+        response = self.client.get(reverse("event-list"), {"q": "quant"})
+        self.assertEqual(list(response.context["events"]), [title_hit, description_hit])
+
+        title_hit.title = "Classical Computing Summit"
+        title_hit.save()
+        response = self.client.get(reverse("event-list"), {"q": "quantum"})
+        self.assertEqual(list(response.context["events"]), [description_hit])
+
+        description_hit.delete()
+        response = self.client.get(reverse("event-list"), {"q": "quantum"})
+        self.assertEqual(list(response.context["events"]), [])
+
+    def test_autocomplete_suggests_titles_and_locations_by_prefix(self):
+        for title, location in [
+            ("Quantum Summit", "Sector 7"),
+            ("Quasar Watch", "Sector 9"),
+            ("Star Gazing", "Sector 7"),
+        ]:
+            Event.objects.create(
+                organizer=self.organizer,
+                **{**self.event_data, "title": title, "location": location},
+            )
+
+        response = self.client.get(reverse("event-autocomplete"), {"q": "qua"})
+        self.assertEqual(
+            response.json(),
+            {"titles": ["Quantum Summit", "Quasar Watch"], "locations": []},
+        )
+        self.assertIn("max-age", response["Cache-Control"])
+
+        response = self.client.get(reverse("event-autocomplete"), {"q": "sec"})
+        self.assertEqual(response.json()["locations"], ["Sector 7", "Sector 9"])
+
+        # An edit marks the index dirty: requests keep getting the previous
+        # index while it is rebuilt off the request path.
+        Event.objects.filter(title="Star Gazing").get().delete()
+        suggester = get_suggester()
+        with mock.patch("events.autocomplete.threading.Thread") as thread:
+            self.assertEqual(suggest("sta")["titles"], ["Star Gazing"])
+        thread.return_value.start.assert_called_once()
+        suggester._rebuild()
+        cache.clear()
+        self.assertEqual(suggest("sta")["titles"], [])
+
+    def test_conditional_get_returns_304_until_the_event_changes(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        api_url = reverse("api-events-detail", args=[event.pk])
+        page_url = reverse("event-detail", kwargs={"slug": event.slug})
+
+        api_etag = self.api_client.get(api_url)["ETag"]
+        page = self.client.get(page_url)
+        self.assertIn("Last-Modified", page)
+
+        self.assertEqual(
+            self.api_client.get(api_url, HTTP_IF_NONE_MATCH=api_etag).status_code, 304
+        )
+        self.assertEqual(
+            self.client.get(page_url, HTTP_IF_NONE_MATCH=page["ETag"]).status_code,
+            304,
+        )
+        list_response = self.api_client.get(reverse("api-events-list"))
+        self.assertEqual(
+            self.api_client.get(
+                reverse("api-events-list"), HTTP_IF_NONE_MATCH=list_response["ETag"]
+            ).status_code,
+            304,
+        )
+
+        admit_registration(event=event, participant=self.user)
+        self.assertEqual(
+            self.api_client.get(api_url, HTTP_IF_NONE_MATCH=api_etag).status_code, 200
+        )
+        self.assertEqual(
+            self.client.get(page_url, HTTP_IF_NONE_MATCH=page["ETag"]).status_code,
+            200,
+        )
+
+        # A pending flash message is always rendered, never answered with 304.
+        etag = self.client.get(page_url)["ETag"]
+        self.client.post(reverse("event-register", kwargs={"slug": event.slug}))
+        flashed = self.client.get(page_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(flashed.status_code, 200)
+        self.assertNotIn("ETag", flashed)
+
+    def test_upcoming_events_cache_is_invalidated_by_event_changes(self):
+        cache.clear()
+        self.assertEqual(upcoming_events(), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(upcoming_events(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        self.assertEqual([e.pk for e in upcoming_events()], [event.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        self.assertEqual(upcoming_events(), [])
+
+    def test_registrations_only_invalidate_their_own_event(self):
+        event = Event.objects.get(
+            pk=Event.objects.create(organizer=self.organizer, **self.event_data).pk
+        )
+        tags = [EVENTS_TAG, event_tag(event.pk)]
+        before = tag_versions(tags)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            admit_registration(event=event, participant=self.user)
+            event.capacity = 20
+            event.save()
+        after = tag_versions(tags)
+        self.assertEqual(after[EVENTS_TAG], before[EVENTS_TAG])
+        self.assertNotEqual(after[event_tag(event.pk)], before[event_tag(event.pk)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.location = "Orbital Dock"
+            event.save()
+        self.assertNotEqual(tag_versions(tags)[EVENTS_TAG], after[EVENTS_TAG])
+
+    def test_cache_timeouts_are_capped_for_a_per_process_cache(self):
+        self.assertEqual(cache_timeout(3600), LOCAL_CACHE_TIMEOUT)
+        with mock.patch("events.cache.is_shared_cache", return_value=True):
+            self.assertEqual(cache_timeout(3600), 3600)
+            self.assertEqual(cache_timeout(), 300)
+
+    def test_event_detail_briefing_is_served_from_fragment_cache(self):
+        cache.clear()
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        url = reverse("event-detail", kwargs={"slug": event.slug})
+        self.client.logout()
+
+        self.assertContains(self.client.get(url), "Test Event")
+        # Bypass save() so the cached fragment is not invalidated.
+        Event.objects.filter(pk=event.pk).update(title="Renamed Event")
+        self.assertContains(self.client.get(url), "Test Event")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.title = "Renamed Event"
+            event.save()
+        self.assertContains(self.client.get(url), "Renamed Event")
+
+    @override_settings(ANONYMOUS_PAGE_CACHE=True)
+    def test_anonymous_page_cache_serves_public_pages_until_events_change(self):
+        cache.clear()
+        anonymous = Client()
+        url = reverse("event-list")
+
+        first = anonymous.get(url)
+        self.assertIn("s-maxage", first["Cache-Control"])
+        self.assertFalse(first.cookies)
+        with self.assertNumQueries(0):
+            hit = anonymous.get(url)
+        self.assertEqual(hit.content, first.content)
+        self.assertEqual(hit["X-Frame-Options"], first["X-Frame-Options"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                organizer=self.organizer, **{**self.event_data, "title": "Fresh Launch"}
+            )
+        self.assertContains(anonymous.get(url), "Fresh Launch")
+
+        event = Event.objects.get(title="Fresh Launch")
+        detail_url = reverse("event-detail", kwargs={"slug": event.slug})
+        detail = anonymous.get(detail_url)
+        anonymous.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            admit_registration(event=event, participant=self.user)
+        with self.assertNumQueries(0):
+            anonymous.get(url)
+        self.assertNotEqual(anonymous.get(detail_url).content, detail.content)
+
+        signed_in = Client()
+        signed_in.login(username="testuser", password="password")
+        self.assertNotIn("public", signed_in.get(url).get("Cache-Control", ""))
+
+    def test_sitemap_index_pages_and_caches_event_sitemaps(self):
+        cache.clear()
+        events = [
+            Event.objects.create(
+                organizer=self.organizer, **{**self.event_data, "title": f"Launch {i}"}
+            )
+            for i in range(3)
+        ]
+
+        with mock.patch.object(EventSitemap, "limit", 2):
+            index = self.client.get("/sitemap.xml")
+            self.assertContains(index, "/sitemap-events.xml?p=2")
+
+            page_two = self.client.get("/sitemap-events.xml?p=2")
+            self.assertContains(page_two, events[2].slug)
+            self.assertNotContains(page_two, events[0].slug)
+            # One aggregate for the key; stray query parameters share the entry.
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    self.client.get("/sitemap-events.xml?p=2&utm=x").content,
+                    page_two.content,
+                )
+
+            # A sign-up moves updated_at without touching the listing fields,
+            # and the page is rebuilt rather than served with a stale lastmod.
+            admit_registration(event=events[2], participant=self.user)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get("/sitemap-events.xml?p=2")
+            self.assertGreater(len(queries), 1)
+
+    def test_calendar_feed_lists_registered_events_and_revalidates(self):
+        cache.clear()
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        ics = self.client.get(reverse("event-calendar", kwargs={"slug": event.slug}))
+        self.assertEqual(ics["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertContains(ics, "SUMMARY:Test Event\r\n")
+
+        admit_registration(event=event, participant=self.user)
+        feed_url = self.client.get(reverse("user-events")).context["calendar_feed_url"]
+        poller = Client()
+        feed = poller.get(feed_url)
+        self.assertContains(feed, f"UID:event-{event.pk}@")
+        self.assertIn("private", feed["Cache-Control"])
+
+        with self.assertNumQueries(2):
+            response = poller.get(feed_url, HTTP_IF_NONE_MATCH=feed["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        # A sign-up bumps updated_at but changes nothing the feed shows.
+        admit_registration(event=event, participant=self.organizer)
+        response = poller.get(feed_url, HTTP_IF_NONE_MATCH=feed["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        event.title = "Moved Launch"
+        event.save()
+        self.assertContains(
+            poller.get(feed_url, HTTP_IF_NONE_MATCH=feed["ETag"]), "Moved Launch"
+        )
+        self.assertEqual(poller.get("/calendar/forged.ics").status_code, 404)
+
+        self.client.post(reverse("calendar-feed-reset"))
+        self.assertEqual(poller.get(feed_url).status_code, 404)
+        new_url = self.client.get(reverse("user-events")).context["calendar_feed_url"]
+        self.assertNotEqual(new_url, feed_url)
+        self.assertContains(poller.get(new_url), f"UID:event-{event.pk}@")
+
+    def test_webhook_dispatcher_bounds_queue_and_reuses_sessions(self):
+        dispatcher = WebhookDispatcher(workers=1, queue_size=1)
+        started, release = threading.Event(), threading.Event()
+        deliveries = [
+            WebhookDelivery(
+                pk=pk, webhook=Webhook(url=f"https://hooks.example.com/{pk}"), body="{}"
+            )
+            for pk in range(3)
+        ]
+
+        def post(url, **kwargs):
+            started.set()
+            release.wait(5)
+            return mock.Mock(status_code=200)
+
+        with mock.patch("requests.Session.post", side_effect=post) as session_post:
+            self.assertTrue(dispatcher.submit(deliveries[0]))
+            started.wait(5)
+            self.assertTrue(dispatcher.submit(deliveries[1]))
+            self.assertFalse(dispatcher.submit(deliveries[2]))
+            release.set()
+            outcomes = dispatcher.collect(2)
+
+        self.assertEqual(session_post.call_count, 2)
+        self.assertEqual({outcome.delivery_id for outcome in outcomes}, {0, 1})
+        stats = dispatcher.stats()
+        self.assertEqual((stats["sent"], stats["dropped"]), (2, 1))
+        self.assertEqual(stats["sessions"], 1)
+
+    def test_webhook_outbox_retries_with_backoff_then_dead_letters(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        webhook = Webhook.objects.create(
+            event=event, url="https://hooks.example.com/in", max_retries=1
+        )
+        admit_registration(event=event, participant=self.user)
+        delivery = WebhookDelivery.objects.get(webhook=webhook)
+        self.assertEqual(delivery.event_type, "registration.created")
+        self.assertEqual(
+            json.loads(delivery.body)["participant"]["username"], "testuser"
+        )
+
+        refused = requests.ConnectionError("refused")
+        with mock.patch("requests.Session.post", side_effect=refused):
+            call_command("deliver_webhooks", "--once", stdout=StringIO())
+            delivery.refresh_from_db()
+            self.assertEqual((delivery.status, delivery.attempts), ("pending", 1))
+            self.assertGreater(delivery.next_attempt_at, timezone.now())
+
+            WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+            call_command(
+                "deliver_webhooks", "--once", stdout=StringIO(), stderr=StringIO()
+            )
+            delivery.refresh_from_db()
+            self.assertEqual((delivery.status, delivery.attempts), ("dead", 2))
+
+        change_registration_status(Registration.objects.get(event=event), "cancelled")
+        with mock.patch(
+            "requests.Session.post", return_value=mock.Mock(status_code=204)
+        ):
+            call_command("deliver_webhooks", "--once", stdout=StringIO())
+        self.assertEqual(
+            WebhookDelivery.objects.get(
+                event_type="registration.status_changed"
+            ).status,
+            "delivered",
+        )
+
+    @skipUnless(find_spec("httpx"), "requires the webhooks extra (httpx)")
+    def test_async_webhook_worker_delivers_outbox_rows(self):
+        import httpx
+
+        from .webhook_async import AsyncWebhookWorker
+
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        Webhook.objects.create(event=event, url="https://up.example.com/hook")
+        Webhook.objects.create(event=event, url="https://down.example.com/hook")
+        admit_registration(event=event, participant=self.user)
+        admit_registration(event=event, participant=self.organizer)
+
+        def handler(request):
+            return httpx.Response(503 if request.url.host.startswith("down") else 200)
+
+        # One slot per host: each host's second row is handed back to the
+        # outbox and picked up once the first is done, never left leased.
+        worker = AsyncWebhookWorker(per_host=1, transport=httpx.MockTransport(handler))
+        async_to_sync(worker.run)(once=True)
+
+        self.assertEqual((worker.delivered, worker.failed), (2, 2))
+        statuses = set(WebhookDelivery.objects.values_list("webhook__url", "status"))
+        self.assertEqual(
+            statuses,
+            {
+                ("https://up.example.com/hook", "delivered"),
+                ("https://down.example.com/hook", "pending"),
+            },
+        )
+
+    @override_settings(WEBHOOK_CIRCUIT_THRESHOLD=2)
+    def test_webhook_circuit_opens_after_failures_and_half_opens_later(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        webhook = Webhook.objects.create(event=event, url="https://slow.example.com/")
+        admit_registration(event=event, participant=self.user)
+        admit_registration(event=event, participant=self.organizer)
+
+        with mock.patch("requests.Session.post", side_effect=requests.Timeout()):
+            self.assertEqual(len(deliver_due()), 2)
+        webhook.refresh_from_db()
+        self.assertEqual((webhook.circuit_state, webhook.failure_count), ("open", 2))
+
+        # Open: due deliveries are held back without spending retries.
+        WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_due(), [])
+
+        self.client.login(username="organizer", password="password")
+        page = self.client.get(reverse("event-detail", kwargs={"slug": event.slug}))
+        self.assertContains(page, "Circuit open")
+        self.assertContains(page, "5s+")
+
+        # After the cooldown one trial goes out; its success closes the circuit.
+        Webhook.objects.update(circuit_open_until=timezone.now())
+        ok = mock.Mock(status_code=200)
+        with mock.patch("requests.Session.post", return_value=ok):
+            self.assertEqual(len(deliver_due()), 1)
+            webhook.refresh_from_db()
+            self.assertEqual(webhook.circuit_state, "closed")
+            self.assertEqual(len(deliver_due()), 1)
+        webhook.refresh_from_db()
+        self.assertEqual(webhook.success_percent, 50)
+
+    @override_settings(WEBHOOK_CIRCUIT_THRESHOLD=1)
+    def test_open_circuit_releases_the_rest_of_the_round(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        webhook = Webhook.objects.create(event=event, url="https://dead.example.com/")
+        record_deliveries([webhook], "registration.created", [{}] * 6)
+
+        # The first failure opens the circuit while one delivery per worker is
+        # in flight; the two still waiting are not sent.
+        with mock.patch("requests.Session.post", side_effect=requests.Timeout()):
+            self.assertEqual(len(deliver_due()), 4)
+        self.assertEqual(
+            WebhookDelivery.objects.filter(attempts=0, status="pending").count(), 2
+        )
+
+        # A failure outside requests is recorded instead of hanging the round.
+        Webhook.objects.update(circuit_state="closed", circuit_open_until=None)
+        with mock.patch(
+            "events.webhook_utils.signed_request", side_effect=ValueError("bad body")
+        ):
+            self.assertEqual(len(deliver_due()), 2)
+        self.assertEqual(
+            WebhookDelivery.objects.filter(last_error="ValueError: bad body").count(),
+            2,
+        )
+
+    def test_batching_webhook_coalesces_notifications_into_one_array(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        Webhook.objects.create(
+            event=event,
+            url="https://batch.example.com/",
+            batch_window_ms=60_000,
+            batch_max_events=3,
+        )
+        participants = [
+            User.objects.create_user(username=f"crew{i}", password="password")
+            for i in range(3)
+        ]
+        ok = mock.Mock(status_code=200)
+        with mock.patch("requests.Session.post", return_value=ok) as post:
+            for participant in participants[:2]:
+                admit_registration(event=event, participant=participant)
+            self.assertEqual(deliver_due(), [])
+
+            # The third notification fills the batch and releases it early.
+            admit_registration(event=event, participant=participants[2])
+            self.assertEqual(len(deliver_due()), 3)
+
+        post.assert_called_once()
+        body = json.loads(post.call_args.kwargs["data"])
+        self.assertEqual(
+            [item["participant"]["username"] for item in body],
+            ["crew0", "crew1", "crew2"],
+        )
+        first_id = post.call_args.kwargs["headers"]["X-EventHorizon-Delivery"]
+        self.assertEqual(
+            set(WebhookDelivery.objects.values_list("status", flat=True)),
+            {"delivered"},
+        )
+
+        # A retried batch is resent as it was, without newer notifications.
+        for i in range(3, 5):
+            crew = User.objects.create_user(username=f"crew{i}", password="password")
+            admit_registration(event=event, participant=crew)
+        WebhookDelivery.objects.filter(status="pending").update(
+            next_attempt_at=timezone.now()
+        )
+        refused = requests.ConnectionError("refused")
+        with mock.patch("requests.Session.post", side_effect=refused) as failed:
+            self.assertEqual(len(deliver_due()), 2)
+        batch_id = failed.call_args.kwargs["headers"]["X-EventHorizon-Delivery"]
+        self.assertTrue(batch_id.startswith("batch-"))
+        self.assertNotEqual(batch_id, first_id)
+        late = User.objects.create_user(username="crew5", password="password")
+        admit_registration(event=event, participant=late)
+        WebhookDelivery.objects.filter(attempts=1).update(
+            next_attempt_at=timezone.now()
+        )
+        with mock.patch("requests.Session.post", return_value=ok) as post:
+            self.assertEqual(len(deliver_due()), 2)
+        body = json.loads(post.call_args.kwargs["data"])
+        self.assertEqual(
+            [item["participant"]["username"] for item in body], ["crew3", "crew4"]
+        )
+        self.assertEqual(
+            post.call_args.kwargs["headers"]["X-EventHorizon-Delivery"], batch_id
+        )
+
+    @override_settings(WEBHOOK_LEASE_SECONDS=5)
+    def test_deliver_due_claims_only_what_fits_in_the_lease(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        webhook = Webhook.objects.create(event=event, url="https://slow.example.com/")
+        record_deliveries([webhook], "registration.created", [{}] * 6)
+
+        # Four workers with a 5s timeout can finish four sends in a 5s lease.
+        ok = mock.Mock(status_code=200)
+        with mock.patch("requests.Session.post", return_value=ok):
+            self.assertEqual(len(deliver_due()), 4)
+            self.assertEqual(len(deliver_due()), 2)
+
+    def test_webhook_deliveries_are_signed_with_the_secret(self):
+        event = Event.objects.create(organizer=self.organizer, **self.event_data)
+        Webhook.objects.create(
+            event=event, url="https://signed.example.com/", secret="s3cret"
+        )
+        admit_registration(event=event, participant=self.user)
+        delivery = WebhookDelivery.objects.get()
+
+        ok = mock.Mock(status_code=200)
+        with mock.patch("requests.Session.post", return_value=ok) as post:
+            deliver_due()
+
+        body, headers = post.call_args.kwargs["data"], post.call_args.kwargs["headers"]
+        self.assertEqual(body, delivery.body.encode())
+        self.assertEqual(headers["X-EventHorizon-Delivery"], str(delivery.pk))
+        signed = f"{headers['X-EventHorizon-Timestamp']}.{delivery.pk}.".encode() + body
+        expected = hmac.new(b"s3cret", signed, hashlib.sha256).hexdigest()
+        self.assertEqual(headers["X-EventHorizon-Signature"], f"sha256={expected}")
@@ -28,8 +28,18 @@ router.register(
 urlpatterns = [
     path("api/", include(router.urls)),
     path("events/", views.EventListView.as_view(), name="event-list"),
+    path(
+        "events/autocomplete/",
+        views.EventAutocompleteView.as_view(),
+        name="event-autocomplete",
+    ),
     path("events/new/", views.EventCreateView.as_view(), name="event-create"),
     path("events/<slug:slug>/", views.EventDetailView.as_view(), name="event-detail"),
+    path(
+        "events/<slug:slug>/calendar.ics",
+        views.EventCalendarView.as_view(),
+        name="event-calendar",
+    ),
     path(
         "events/<slug:slug>/update/",
         views.EventUpdateView.as_view(),
@@ -55,6 +65,16 @@ urlpatterns = [
         views.EventExportView.as_view(),
         name="event-export",
     ),
+    path(
+        "events/<slug:slug>/exports/",
+        views.ExportJobCreateView.as_view(),
+        name="export-job-create",
+    ),
+    path(
+        "exports/<int:pk>/download/",
+        views.ExportJobDownloadView.as_view(),
+        name="export-job-download",
+    ),
     path(
         "events/<slug:slug>/webhooks/new/",
         views.WebhookCreateView.as_view(),
@@ -80,5 +100,20 @@ urlpatterns = [
         views.ManageRegistrationView.as_view(),
         name="manage-registration",
     ),
+    path(
+        "events/<slug:slug>/registrations/bulk/",
+        views.BulkManageRegistrationView.as_view(),
+        name="registration-bulk-manage",
+    ),
     path("my-events/", views.UserEventListView.as_view(), name="user-events"),
+    path(
+        "calendar/reset/",
+        views.CalendarFeedResetView.as_view(),
+        name="calendar-feed-reset",
+    ),
+    path(
+        "calendar/<str:token>.ics",
+        views.CalendarFeedView.as_view(),
+        name="calendar-feed",
+    ),
 ]
@@ -15,15 +15,23 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import csv
+import os
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Q
-from django.http import HttpResponse
+from django.core.files.storage import FileSystemStorage
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -33,62 +41,44 @@ from django.views.generic import (
     View,
 )
 
-from .models import Event, Registration, Webhook
+from storage.factory import get_private_storage
+
+from .autocomplete import suggest
+from .cache import cache_timeout, event_tag, tag_versions
+from .conditional import (
+    EVENT_ETAG_FIELDS,
+    compute_validators,
+    not_modified,
+    set_validators,
+)
+from .exports import available_formats, csv_row, iter_roster_rows, roster_columns
+from .ical import (
+    EVENT_FIELDS as ICAL_EVENT_FIELDS,
+    feed_token,
+    render_calendar,
+    render_components,
+    render_event,
+    reset_feed_token,
+    user_id_for_token,
+)
+from .models import Event, ExportJob, Registration, Webhook
 from .notifications import (
     send_organizer_registration_email,
     send_participant_registration_recorded_email,
-    send_participant_status_changed_email,
 )
+from .registration import (
+    BULK_STATUS_MAX_IDS,
+    AlreadyRegistered,
+    EventFull,
+    admit_registration,
+    bulk_change_status,
+    change_registration_status,
+    notify_status_changed,
+    withdraw_registration,
+)
+from .search import get_search_backend
 from .utils import extract_registration_schema
-from .webhook_utils import trigger_webhook_async
-
-
-def _trigger_registration_created_webhooks(
-    *, event, registration, participant, answers
-):
-    webhooks = event.webhooks.filter(is_active=True)
-    if not webhooks.exists():
-        return
-
-    payload = {
-        "event": "registration.created",
-        "mission_id": event.slug,
-        "mission_title": event.title,
-        "participant": {
-            "username": participant.username,
-            "email": getattr(participant, "email", ""),
-        },
-        "status": registration.status,
-        "registered_at": registration.registered_at,
-        "answers": answers,
-    }
-
-    for webhook in webhooks:
-        trigger_webhook_async(webhook.url, payload)
-
-
-def _trigger_registration_status_changed_webhooks(
-    *, event, registration, participant, old_status, new_status
-):
-    webhooks = event.webhooks.filter(is_active=True)
-    if not webhooks.exists():
-        return
-
-    payload = {
-        "event": "registration.status_changed",
-        "mission_id": event.slug,
-        "mission_title": event.title,
-        "participant": {
-            "username": participant.username,
-            "email": getattr(participant, "email", ""),
-        },
-        "old_status": old_status,
-        "new_status": new_status,
-        "updated_at": timezone.now(),
-    }
-
-    for webhook in webhooks:
-        trigger_webhook_async(webhook.url, payload)
+from .webhook_utils import webhook_stats
 
 
 class EventListView(ListView):
@@ -104,9 +94,7 @@ class EventListView(ListView):
         location = self.request.GET.get("location")
 
         if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query) | Q(description__icontains=query)
-            )
+            queryset = get_search_backend().search(queryset, query)
 
         if location:
             queryset = queryset.filter(location__icontains=location)
@@ -120,6 +108,19 @@ class EventListView(ListView):
         return context
 
 
+class EventAutocompleteView(View):
+    """JSON title and location suggestions for the event list search boxes."""
+
+    def get(self, request, *args, **kwargs):
+        response = JsonResponse(suggest(request.GET.get("q", "")))
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=getattr(settings, "AUTOCOMPLETE_CACHE_TIMEOUT", 60),
+        )
+        return response
+
+
 class UserEventListView(LoginRequiredMixin, ListView):
     model = Event
     template_name = "events/user_events.html"
@@ -135,6 +136,9 @@ class UserEventListView(LoginRequiredMixin, ListView):
             .select_related("event")
             .order_by("event__start_time")
         )
+        context["calendar_feed_url"] = self.request.build_absolute_uri(
+            reverse("calendar-feed", args=[feed_token(self.request.user)])
+        )
         return context
 
 
@@ -142,12 +146,45 @@ class EventDetailView(DetailView):
     model = Event
     template_name = "events/event_detail.html"
 
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        # The organizer's page also lists the roster, exports and webhooks,
+        # which the event's validators do not cover. Neither do flash
+        # messages: a page showing one is never answered with (or cached
+        # for) a 304, so the message is rendered and not replayed later.
+        conditional = request.user != self.object.organizer and not len(
+            messages.get_messages(request)
+        )
+
+        if conditional:
+            etag, last_modified = compute_validators(
+                [self.object], EVENT_ETAG_FIELDS, request.user.pk
+            )
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+
+        context = self.get_context_data(object=self.object)
+        response = self.render_to_response(context)
+        if conditional:
+            set_validators(response, request, etag, last_modified)
+        return response
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("organizer__profile")
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        event = self.get_object()
+        event = self.object
         user = self.request.user
 
-        context["webhooks"] = event.webhooks.order_by("-created_at")
+        # The event's public briefing is rendered once per event version and
+        # served from the fragment cache; everything below is per-user.
+        tag = event_tag(event.pk)
+        context["cache_version"] = tag_versions([tag])[tag]
+        # Versions are per process without a shared cache, so the fragment
+        # must not outlive the timeout every other cached entry uses.
+        context["fragment_timeout"] = cache_timeout()
 
         if user.is_authenticated:
             user_registration = Registration.objects.filter(
@@ -158,6 +195,17 @@ class EventDetailView(DetailView):
             context["user_registration"] = user_registration
 
             if user == event.organizer:
+                webhooks = list(event.webhooks.order_by("-created_at"))
+                stats = webhook_stats(webhooks)
+                for webhook in webhooks:
+                    webhook.stats = stats.get(webhook.pk)
+                context["webhooks"] = webhooks
+                context["export_jobs"] = event.export_jobs.order_by("-created_at")[:5]
+                context["export_formats"] = [
+                    (value, label)
+                    for value, label in ExportJob.FORMAT_CHOICES
+                    if value in available_formats()
+                ]
                 context["registrations"] = (
                     Registration.objects.filter(event=event)
                     .select_related("participant", "participant__profile")
@@ -169,6 +217,86 @@ class EventDetailView(DetailView):
         return context
 
 
+def _calendar_response(body, filename=None):
+    response = HttpResponse(body, content_type="text/calendar; charset=utf-8")
+    if filename:
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+class EventCalendarView(View):
+    """A single event as an ``.ics`` file."""
+
+    def get(self, request, slug):
+        event = get_object_or_404(Event.objects.only(*ICAL_EVENT_FIELDS), slug=slug)
+        host = request.get_host()
+        etag, _ = compute_validators(
+            [event], ICAL_EVENT_FIELDS, host, request.scheme, last_modified=False
+        )
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
+
+        body = render_calendar([render_event(event, host, request.scheme)])
+        response = _calendar_response(body, f"{event.slug}.ics")
+        return set_validators(response, request, etag, None)
+
+
+class CalendarFeedResetView(LoginRequiredMixin, View):
+    """Issue a new feed link and revoke the old ones."""
+
+    def post(self, request):
+        reset_feed_token(request.user)
+        messages.success(
+            request,
+            "Calendar link regenerated. Update your calendar app with the new link.",
+        )
+        return redirect("user-events")
+
+
+class CalendarFeedView(View):
+    """
+    The ``registered`` events of the user a feed token was issued to.
+
+    The validators hash only the fields the ``VEVENT`` blocks show, so a
+    sign-up that bumps an event's ``updated_at`` does not make every
+    subscriber download the feed again. There is no ``Last-Modified`` for
+    the same reason.
+    """
+
+    def get(self, request, token):
+        user_id = user_id_for_token(token)
+        if user_id is None:
+            raise Http404("Unknown calendar feed")
+
+        events = list(
+            Event.objects.filter(
+                registrations__participant_id=user_id,
+                registrations__participant__is_active=True,
+                registrations__status="registered",
+            )
+            .order_by("start_time", "id")
+            .only(*ICAL_EVENT_FIELDS)
+        )
+        host = request.get_host()
+        etag, _ = compute_validators(
+            events,
+            ICAL_EVENT_FIELDS,
+            user_id,
+            host,
+            request.scheme,
+            last_modified=False,
+        )
+        response = not_modified(request, etag, None)
+        if response is None:
+            components = render_components(events, host, request.scheme)
+            body = render_calendar(components, name="Event Horizon")
+            response = set_validators(_calendar_response(body), request, etag, None)
+        # The token is the only credential; keep shared caches out of it.
+        patch_cache_control(response, private=True)
+        return response
+
+
 class EventCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Event
     fields = ["title", "description", "start_time", "end_time", "location", "capacity"]
@@ -226,10 +354,6 @@ class EventRegistrationView(LoginRequiredMixin, View):
     def post(self, request, slug):
         event = get_object_or_404(Event, slug=slug)
 
-        if Registration.objects.filter(event=event, participant=request.user).exists():
-            messages.warning(request, "You are already registered for this mission.")
-            return redirect("event-detail", slug=slug)
-
         answers = {}
         if event.registration_schema:
             for question in event.registration_schema:
@@ -239,21 +363,21 @@ class EventRegistrationView(LoginRequiredMixin, View):
                 else:
                     answers[question["id"]] = request.POST.get(key, "")
 
-        current_registrations = event.registrations.filter(status="registered").count()
+        try:
+            registration = admit_registration(
+                event=event, participant=request.user, answers=answers
+            )
+        except AlreadyRegistered:
+            messages.warning(request, "You are already registered for this mission.")
+            return redirect("event-detail", slug=slug)
 
-        if current_registrations >= event.capacity:
-            status_value = "waitlisted"
+        if registration.status == "waitlisted":
             msg_type = messages.INFO
             msg_text = "Mission capacity reached. You have been placed on the standby (wait) list."
         else:
-            status_value = "registered"
             msg_type = messages.SUCCESS
             msg_text = f"Successfully registered for mission: {event.title}"
 
-        registration = Registration.objects.create(
-            event=event, participant=request.user, status=status_value, answers=answers
-        )
-
         if msg_type == messages.INFO:
             messages.info(request, msg_text)
         else:
@@ -264,13 +388,6 @@ class EventRegistrationView(LoginRequiredMixin, View):
             registration=registration, request=request
         )
 
-        _trigger_registration_created_webhooks(
-            event=event,
-            registration=registration,
-            participant=request.user,
-            answers=answers,
-        )
-
         return redirect("event-detail", slug=slug)
 
 
@@ -282,7 +399,7 @@ class EventUnregistrationView(LoginRequiredMixin, View):
         ).first()
 
         if registration:
-            registration.delete()
+            withdraw_registration(registration, request=request)
             messages.info(request, f"You have withdrawn from mission: {event.title}")
         else:
             messages.warning(request, "Registration record not found.")
@@ -290,52 +407,97 @@ class EventUnregistrationView(LoginRequiredMixin, View):
         return redirect("event-detail", slug=slug)
 
 
+class _Echo:
+    """Pseudo-buffer whose ``write`` hands the formatted CSV line straight back."""
+
+    def write(self, value):
+        return value
+
+
 class EventExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    # Rows fetched per server-side cursor round trip, and rows per chunk
+    # flushed to the client.
+    chunk_size = 2000
+    rows_per_flush = 500
+
     def get(self, request, slug):
         event = get_object_or_404(Event, slug=slug)
+        headers, question_ids = roster_columns(event)
 
-        response = HttpResponse(content_type="text/csv")
+        response = StreamingHttpResponse(
+            self.stream_rows(event, headers, question_ids), content_type="text/csv"
+        )
         response["Content-Disposition"] = (
             f'attachment; filename="{event.slug}_roster.csv"'
         )
+        return response
 
-        writer = csv.writer(response)
+    def stream_rows(self, event, headers, question_ids):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(headers)
 
-        headers = ["Username", "Email", "Status", "Registered At"]
+        buffer = []
+        rows = iter_roster_rows(event, question_ids, chunk_size=self.chunk_size)
+        for row in rows:
+            buffer.append(writer.writerow(csv_row(row)))
+            if len(buffer) >= self.rows_per_flush:
+                yield "".join(buffer)
+                buffer = []
 
-        question_ids = []
-        if event.registration_schema:
-            for question in event.registration_schema:
-                headers.append(question["label"])
-                question_ids.append(question["id"])
+        if buffer:
+            yield "".join(buffer)
 
-        writer.writerow(headers)
+    def test_func(self):
+        event = get_object_or_404(Event, slug=self.kwargs["slug"])
+        return self.request.user == event.organizer
 
-        registrations = event.registrations.select_related("participant").all()
-        for reg in registrations:
-            row = [
-                reg.participant.username,
-                reg.participant.email,
-                reg.status,
-                reg.registered_at.strftime("%Y-%m-%d %H:%M:%S"),
-            ]
 
-            if event.registration_schema:
-                for q_id in question_ids:
-                    answer = reg.answers.get(q_id, "")
-                    if isinstance(answer, bool):
-                        answer = "Yes" if answer else "No"
-                    row.append(answer)
+class ExportJobCreateView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def post(self, request, slug):
+        event = get_object_or_404(Event, slug=slug)
+        export_format = request.POST.get("format", "csv")
 
-            writer.writerow(row)
+        if export_format not in available_formats():
+            messages.error(request, "That export format is not available.")
+            return redirect("event-detail", slug=slug)
 
-        return response
+        job = ExportJob.objects.create(
+            event=event, requested_by=request.user, format=export_format
+        )
+        messages.info(
+            request,
+            f"{job.get_format_display()} export queued. "
+            "A download link will appear here when it is ready.",
+        )
+        return redirect("event-detail", slug=slug)
 
     def test_func(self):
         event = get_object_or_404(Event, slug=self.kwargs["slug"])
         return self.request.user == event.organizer
 
 
+class ExportJobDownloadView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def get(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk, status="completed")
+        storage = get_private_storage()
+
+        if isinstance(storage, FileSystemStorage):
+            return FileResponse(
+                storage.open(job.file_name, "rb"),
+                as_attachment=True,
+                filename=os.path.basename(job.file_name),
+            )
+
+        # Remote private storage hands out short-lived presigned URLs
+        return redirect(storage.url(job.file_name))
+
+    def test_func(self):
+        job = get_object_or_404(
+            ExportJob.objects.select_related("event"), pk=self.kwargs["pk"]
+        )
+        return self.request.user == job.event.organizer
+
+
 class ManageRegistrationView(LoginRequiredMixin, UserPassesTestMixin, View):
     def post(self, request, registration_id):
         registration = get_object_or_404(Registration, id=registration_id)
@@ -345,45 +507,42 @@ class ManageRegistrationView(LoginRequiredMixin, UserPassesTestMixin, View):
         old_status = registration.status
 
         if action == "approve":
-            current_registrations = event.registrations.filter(
-                status="registered"
-            ).count()
-            if current_registrations >= event.capacity:
+            try:
+                old_status = change_registration_status(
+                    registration, "registered", request=request
+                )
+            except EventFull:
                 messages.error(request, "Cannot approve: Mission is at full capacity.")
                 return redirect("event-detail", slug=event.slug)
 
-            registration.status = "registered"
-            registration.save()
             messages.success(
                 request,
                 f"Approved {registration.participant.username} for the mission.",
             )
 
         elif action == "waitlist":
-            registration.status = "waitlisted"
-            registration.save()
+            old_status = change_registration_status(
+                registration, "waitlisted", request=request
+            )
             messages.info(
                 request, f"Moved {registration.participant.username} to standby list."
             )
 
         elif action == "cancel":
-            registration.status = "cancelled"
-            registration.save()
+            old_status = change_registration_status(
+                registration, "cancelled", request=request
+            )
             messages.warning(
                 request,
                 f"Updated status for {registration.participant.username} to Not Approved.",
             )
 
         if registration.status != old_status:
-            send_participant_status_changed_email(
-                registration=registration, old_status=old_status, request=request
-            )
-            _trigger_registration_status_changed_webhooks(
+            notify_status_changed(
                 event=event,
-                registration=registration,
-                participant=registration.participant,
+                registrations=[registration],
                 old_status=old_status,
-                new_status=registration.status,
+                request=request,
             )
 
         return redirect("event-detail", slug=event.slug)
@@ -395,9 +554,55 @@ class ManageRegistrationView(LoginRequiredMixin, UserPassesTestMixin, View):
         return self.request.user == registration.event.organizer
 
 
+class BulkManageRegistrationView(LoginRequiredMixin, UserPassesTestMixin, View):
+    STATUS_BY_ACTION = {
+        "approve": "registered",
+        "waitlist": "waitlisted",
+        "cancel": "cancelled",
+    }
+
+    def post(self, request, slug):
+        event = get_object_or_404(Event, slug=slug)
+        new_status = self.STATUS_BY_ACTION.get(request.POST.get("action"))
+        registration_ids = [
+            value
+            for value in request.POST.getlist("registration_ids")
+            if value.isdigit()
+        ]
+
+        if new_status is None or not registration_ids:
+            messages.warning(request, "Select crew members and an action first.")
+            return redirect("event-detail", slug=slug)
+        if len(registration_ids) > BULK_STATUS_MAX_IDS:
+            messages.error(
+                request,
+                f"Select at most {BULK_STATUS_MAX_IDS} crew members at a time.",
+            )
+            return redirect("event-detail", slug=slug)
+
+        try:
+            changed = bulk_change_status(
+                event=event,
+                registration_ids=registration_ids,
+                new_status=new_status,
+                request=request,
+            )
+        except EventFull as exc:
+            # The exception counts only the rows that would actually change.
+            messages.error(request, f"Cannot approve crew members: {exc}.")
+            return redirect("event-detail", slug=slug)
+
+        messages.success(request, f"Updated {len(changed)} crew registrations.")
+        return redirect("event-detail", slug=slug)
+
+    def test_func(self):
+        event = get_object_or_404(Event, slug=self.kwargs["slug"])
+        return self.request.user == event.organizer
+
+
 class WebhookCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
     model = Webhook
-    fields = ["url", "secret", "is_active"]
+    fields = ["url", "secret", "is_active", "batch_window_ms", "batch_max_events"]
     template_name = "events/webhook_form.html"
 
     def get_event(self):
@@ -423,13 +628,18 @@ class WebhookCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
 
 class WebhookUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Webhook
-    fields = ["url", "secret", "is_active"]
+    fields = ["url", "secret", "is_active", "batch_window_ms", "batch_max_events"]
     template_name = "events/webhook_form.html"
 
     def test_func(self):
         webhook = self.get_object()
         return self.request.user == webhook.event.organizer
 
+    def form_valid(self, form):
+        if "url" in form.changed_data:
+            form.instance.reset_circuit()
+        return super().form_valid(form)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["event"] = self.object.event
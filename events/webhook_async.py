@@ -0,0 +1,192 @@
+# Event Horizon - Futuristic Event Management Platform
+# Copyright (C) 2025-2026 Arnav Ghosh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Asyncio webhook delivery worker (``manage.py run_webhook_worker``).
+
+This is an alternative to ``deliver_webhooks`` for deployments that fan out to
+many slow receivers. It works on the same outbox rows, with the same leasing,
+backoff and dead-lettering as :mod:`events.webhook_utils`. The difference is
+that one event loop and one pooled ``httpx.AsyncClient`` keep up to
+``concurrency`` deliveries in flight, instead of one per thread. At most
+``per_host`` of those go to any single receiver. Nothing is claimed beyond
+that: webhooks already in flight to a saturated host are skipped when
+claiming, and claimed rows that still find no free slot for their host are
+handed straight back to the outbox. A slow receiver therefore never holds
+slots, or leases, that deliveries to other hosts could use.
+
+The ORM is synchronous, so claiming and recording outcomes run through
+``sync_to_async`` on one database thread. Only the HTTP requests are
+concurrent.
+
+Requires the ``webhooks`` extra (``httpx``).
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .webhook_utils import (
+    DeliveryOutcome,
+    claim_deliveries,
+    record_outcome,
+    release_deliveries,
+    signed_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWebhookWorker:
+    def __init__(
+        self,
+        *,
+        concurrency=None,
+        per_host=None,
+        timeout=None,
+        lease=None,
+        transport=None,
+    ):
+        self.concurrency = concurrency or getattr(
+            settings, "WEBHOOK_ASYNC_CONCURRENCY", 1000
+        )
+        self.per_host = per_host or getattr(settings, "WEBHOOK_PER_HOST_LIMIT", 10)
+        self.timeout = timeout or getattr(settings, "WEBHOOK_TIMEOUT", 5)
+        self.lease = lease or getattr(settings, "WEBHOOK_LEASE_SECONDS", 60)
+        self.transport = transport
+        self._in_flight = set()
+        # Per host: how many deliveries are in flight, and the webhooks they
+        # (or rows handed back for want of a slot) belong to.
+        self._host_load = Counter()
+        self._host_webhooks = defaultdict(Counter)
+        self._deferred = defaultdict(set)
+        self.delivered = self.failed = 0
+
+    @staticmethod
+    def _host(url):
+        parts = urlsplit(url)
+        return (parts.scheme, parts.netloc)
+
+    def _saturated_webhooks(self):
+        return [
+            webhook_id
+            for host, load in self._host_load.items()
+            if load >= self.per_host
+            for webhook_id in (*self._host_webhooks[host], *self._deferred[host])
+        ]
+
+    def _start(self, client, delivery):
+        """Start ``delivery`` if its host has a free slot; return whether it did."""
+        host = self._host(delivery.webhook.url)
+        if self._host_load[host] >= self.per_host:
+            self._deferred[host].add(delivery.webhook_id)
+            return False
+
+        self._host_load[host] += 1
+        self._host_webhooks[host][delivery.webhook_id] += 1
+        task = asyncio.create_task(self._deliver(client, delivery))
+        self._in_flight.add(task)
+
+        def finished(task):
+            self._in_flight.discard(task)
+            self._host_load[host] -= 1
+            webhooks = self._host_webhooks[host]
+            webhooks[delivery.webhook_id] -= 1
+            if not webhooks[delivery.webhook_id]:
+                del webhooks[delivery.webhook_id]
+            # A slot is free again, so rows handed back may be claimed.
+            self._deferred.pop(host, None)
+
+        task.add_done_callback(finished)
+        return True
+
+    async def run(self, *, once=False, poll_interval=1.0):
+        """
+        Deliver due webhooks until cancelled.
+
+        With ``once``, exit as soon as nothing is due and no delivery is in
+        flight.
+        """
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency,
+        )
+        timeout = httpx.Timeout(self.timeout)
+        async with httpx.AsyncClient(
+            limits=limits, timeout=timeout, transport=self.transport
+        ) as client:
+            while True:
+                free = self.concurrency - len(self._in_flight)
+                claimed = []
+                if free > 0:
+                    claimed = await sync_to_async(claim_deliveries)(
+                        free,
+                        lease=self.lease,
+                        exclude_webhooks=self._saturated_webhooks(),
+                    )
+                overflow = [
+                    delivery
+                    for delivery in claimed
+                    if not self._start(client, delivery)
+                ]
+                if overflow:
+                    await sync_to_async(release_deliveries)(overflow)
+
+                if claimed and len(self._in_flight) >= self.concurrency:
+                    # Full slots: wait for one to open before claiming more.
+                    await asyncio.wait(
+                        self._in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                elif self._in_flight:
+                    await asyncio.wait(
+                        self._in_flight,
+                        timeout=poll_interval,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                elif once:
+                    return
+                else:
+                    await asyncio.sleep(poll_interval)
+
+    async def _deliver(self, client, delivery):
+        url = delivery.webhook.url
+        body, headers = signed_request(delivery)
+        started = time.monotonic()
+        response_status = None
+        error = ""
+        try:
+            response = await client.post(url, content=body, headers=headers)
+            response_status = response.status_code
+            response.raise_for_status()
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            error = str(e) or e.__class__.__name__
+            logger.error(f"Failed to send webhook to {url}: {error}")
+
+        outcome = DeliveryOutcome(
+            delivery.pk, response_status, error, time.monotonic() - started
+        )
+        await sync_to_async(record_outcome)(delivery, outcome)
+        if error:
+            self.failed += 1
+        else:
+            self.delivered += 1
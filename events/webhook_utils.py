@@ -1,33 +1,705 @@
-import threading
-import requests
+import hashlib
+import hmac
 import json
 import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from datetime import timedelta
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .models import Webhook, WebhookDelivery
+
+try:
+    import orjson
+except ImportError:  # Optional "webhooks" extra
+    orjson = None
 
 logger = logging.getLogger(__name__)
+_django_encoder = DjangoJSONEncoder()
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended.
+LATENCY_BUCKETS = (100, 500, 1000, 5000, None)
+LATENCY_LABELS = ("<100ms", "<500ms", "<1s", "<5s", "5s+")
+STATS_WINDOW = timedelta(days=7)
 
+SIGNATURE_HEADER = "X-EventHorizon-Signature"
+TIMESTAMP_HEADER = "X-EventHorizon-Timestamp"
+DELIVERY_HEADER = "X-EventHorizon-Delivery"
 
-def trigger_webhook_async(url, payload):
+DeliveryOutcome = namedtuple(
+    "DeliveryOutcome", ["delivery_id", "response_status", "error", "duration"]
+)
+
+
+class WebhookDispatcher:
     """
-    Sends a webhook request in a separate thread.
+    Send outbox deliveries from a fixed pool of worker threads.
+
+    Deliveries wait in a bounded queue. When it is full, :meth:`submit` waits
+    up to ``enqueue_timeout`` seconds and then drops the delivery, counting
+    it in :meth:`stats`, so a surge costs a bounded amount of memory and
+    threads instead of one thread per request. Each destination host gets
+    its own keep-alive ``requests.Session``, so repeat deliveries reuse the
+    TCP/TLS connection. At most ``max_sessions`` are kept, least recently
+    used first out.
+
+    Workers only do network I/O. Each attempt produces a
+    :class:`DeliveryOutcome` that the caller reads back with :meth:`collect`
+    and records in the database.
+
+    Workers start on first use and are restarted after a fork, so every
+    process gets its own pool.
     """
 
-    def send_request():
+    def __init__(
+        self,
+        *,
+        workers=4,
+        queue_size=1000,
+        enqueue_timeout=0.0,
+        timeout=5,
+        max_sessions=64,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.enqueue_timeout = enqueue_timeout
+        self.timeout = timeout
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _start(self):
+        # Called with the lock held.
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._results = queue.Queue()
+        self._sessions = OrderedDict()
+        self._counters = dict.fromkeys(("enqueued", "sent", "failed", "dropped"), 0)
+        self._high_water = 0
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"webhook-worker-{index}", daemon=True
+            )
+            thread.start()
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._start()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def submit(self, delivery):
+        """
+        Queue ``delivery`` (with its ``webhook`` loaded) for sending.
+
+        Returns ``False`` when the queue is full and the delivery was dropped.
+        """
+        self._ensure_started()
         try:
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(
-                url,
-                data=json.dumps(payload, cls=DjangoJSONEncoder),
-                headers=headers,
-                timeout=5,
+            if self.enqueue_timeout > 0:
+                self._queue.put(delivery, timeout=self.enqueue_timeout)
+            else:
+                self._queue.put_nowait(delivery)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning(
+                f"Webhook queue full; dropped delivery to {delivery.webhook.url}"
             )
+            return False
+
+        with self._lock:
+            self._counters["enqueued"] += 1
+            self._high_water = max(self._high_water, self._queue.qsize())
+        return True
+
+    def collect(self, count):
+        """Wait for and return the outcomes of ``count`` submitted deliveries."""
+        self._ensure_started()
+        return [self._results.get() for _ in range(count)]
+
+    def stats(self):
+        """Return delivery counters plus the current and peak queue depth."""
+        self._ensure_started()
+        with self._lock:
+            return {
+                **self._counters,
+                "queue_depth": self._queue.qsize(),
+                "queue_high_water": self._high_water,
+                "sessions": len(self._sessions),
+            }
+
+    def _session_for(self, url):
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is not None:
+                self._sessions.move_to_end(host)
+                return session
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+            session.mount(f"{parts.scheme}://", adapter)
+            self._sessions[host] = session
+            if len(self._sessions) > self.max_sessions:
+                # Not closed here: another worker may still be using it. Its
+                # connections are released once it is garbage collected.
+                self._sessions.popitem(last=False)
+            return session
+
+    def _work(self):
+        work_queue, results = self._queue, self._results
+        while True:
+            delivery = work_queue.get()
+            try:
+                results.put(self._send(delivery))
+            finally:
+                work_queue.task_done()
+
+    def _send(self, delivery):
+        url = delivery.webhook.url
+        started = time.monotonic()
+        response_status = None
+        error = ""
+        try:
+            body, headers = signed_request(delivery)
+            response = self._session_for(url).post(
+                url, data=body, headers=headers, timeout=self.timeout
+            )
+            response_status = response.status_code
             response.raise_for_status()
+            self._count("sent")
             logger.info(
                 f"Webhook sent successfully to {url}. Status: {response.status_code}"
             )
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send webhook to {url}: {str(e)}")
+            error = str(e) or e.__class__.__name__
+            self._count("failed")
+            logger.error(f"Failed to send webhook to {url}: {error}")
+        except Exception as e:
+            # Anything else (signing, a bad stored body) must still post an
+            # outcome, or collect() would wait for it forever.
+            error = f"{e.__class__.__name__}: {e}"
+            self._count("failed")
+            logger.exception(f"Unexpected error sending webhook to {url}")
+        return DeliveryOutcome(
+            delivery.pk, response_status, error, time.monotonic() - started
+        )
+
+
+dispatcher = WebhookDispatcher(
+    workers=getattr(settings, "WEBHOOK_WORKERS", 4),
+    queue_size=getattr(settings, "WEBHOOK_QUEUE_SIZE", 1000),
+    enqueue_timeout=getattr(settings, "WEBHOOK_ENQUEUE_TIMEOUT", 0.0),
+    timeout=getattr(settings, "WEBHOOK_TIMEOUT", 5),
+)
+
+
+def serialize_payload(payload):
+    """
+    Serialize a webhook payload to JSON text.
+
+    Uses ``orjson`` when it is installed (the ``webhooks`` extra). Dates and
+    anything else orjson does not handle natively go through
+    ``DjangoJSONEncoder``, so the output matches the stdlib path.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=_django_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()
+    return json.dumps(payload, cls=DjangoJSONEncoder)
+
+
+@lru_cache(maxsize=1024)
+def _signing_key(secret):
+    # Keying HMAC hashes the secret into the inner and outer pads. Doing that
+    # once per secret and copying the keyed object skips it per delivery.
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+def signed_request(delivery, timestamp=None):
+    """
+    Return ``(body, headers)`` for POSTing ``delivery``.
+
+    ``body`` is the stored JSON encoded once; the same bytes are signed and
+    sent. Every request carries the delivery id (the row's pk, or a batch's
+    ``delivery_id``; stable across retries, so receivers can drop
+    duplicates) and a Unix timestamp. When the webhook has
+    a secret, ``X-EventHorizon-Signature`` is ``sha256=`` followed by the hex
+    HMAC-SHA256 of ``"<timestamp>.<delivery id>." + body``. Receivers should
+    reject stale timestamps; ``verify_webhook_signature`` in the Python
+    client example does both checks.
+    """
+    body = delivery.body.encode()
+    delivery_id = getattr(delivery, "delivery_id", None) or str(delivery.pk)
+    timestamp = str(int(time.time() if timestamp is None else timestamp))
+    headers = {
+        "Content-Type": "application/json",
+        DELIVERY_HEADER: delivery_id,
+        TIMESTAMP_HEADER: timestamp,
+    }
+    secret = delivery.webhook.secret
+    if secret:
+        mac = _signing_key(secret).copy()
+        mac.update(f"{timestamp}.{delivery_id}.".encode())
+        mac.update(body)
+        headers[SIGNATURE_HEADER] = f"sha256={mac.hexdigest()}"
+    return body, headers
+
+
+class DeliveryBatch:
+    """
+    Several outbox rows for one batching webhook, sent as one JSON array.
+
+    The array is joined from the rows' stored bodies, so nothing is
+    serialized again. It quacks like a :class:`WebhookDelivery` as far as
+    the dispatcher is concerned. ``pk`` (its first row's) only matches
+    outcomes back to the batch; receivers see ``delivery_id``, derived from
+    every member row, so a retry of the same rows keeps it and any other
+    set of rows gets a new one.
+    """
+
+    def __init__(self, deliveries):
+        self.deliveries = deliveries
+        self.pk = deliveries[0].pk
+        members = ",".join(str(pk) for pk in sorted(row.pk for row in deliveries))
+        self.delivery_id = "batch-" + hashlib.sha256(members.encode()).hexdigest()[:32]
+        self.webhook = deliveries[0].webhook
+        self.body = "[" + ",".join(delivery.body for delivery in deliveries) + "]"
+
+
+def _rows(item):
+    return getattr(item, "deliveries", [item])
+
+
+def record_deliveries(webhooks, event_type, payloads):
+    """
+    Add one outbox row per webhook for each of ``payloads``, with a single
+    ``INSERT`` for the whole operation.
+
+    Call this inside the transaction that makes the change, so the
+    notifications are stored if and only if the change commits.
+
+    For a batching webhook the row is held back for ``batch_window_ms``, so
+    the notifications that follow it within the window go out in the same
+    request. Once ``batch_max_events`` are waiting, they are released early.
+    """
+    bodies = [serialize_payload(payload) for payload in payloads]
+    now = timezone.now()
+    WebhookDelivery.objects.bulk_create(
+        WebhookDelivery(
+            webhook=webhook,
+            event_type=event_type,
+            body=body,
+            next_attempt_at=now + timedelta(milliseconds=webhook.batch_window_ms),
+        )
+        for body in bodies
+        for webhook in webhooks
+    )
+    batching = [webhook for webhook in webhooks if webhook.batch_window_ms]
+    if not batching:
+        return
+
+    # One grouped count for the whole operation decides the early releases.
+    waiting = WebhookDelivery.objects.filter(
+        webhook__in=batching, status="pending", attempts=0, next_attempt_at__gt=now
+    )
+    counts = dict(
+        waiting.values_list("webhook_id").annotate(total=Count("id")).order_by()
+    )
+    full = [
+        webhook.pk
+        for webhook in batching
+        if counts.get(webhook.pk, 0) >= webhook.batch_max_events
+    ]
+    if full:
+        waiting.filter(webhook_id__in=full).update(next_attempt_at=now)
+
+
+def claim_deliveries(limit, *, lease=None, exclude_webhooks=()):
+    """
+    Return up to ``limit`` due deliveries and lease them to the caller.
+
+    Deliveries to the webhooks in ``exclude_webhooks`` are left for later.
+
+    Claiming moves ``next_attempt_at`` forward by ``lease`` seconds
+    (``WEBHOOK_LEASE_SECONDS``, default 60), so other workers skip the rows
+    while they are in flight. If this worker dies, the rows become due again
+    when the lease runs out. ``skip_locked`` lets several workers claim at the
+    same time without blocking each other.
+
+    Deliveries to a webhook whose circuit is open are held back without
+    using up their retries. Once the open period is over, one delivery per
+    webhook is let through as a half-open trial; :func:`record_outcome`
+    closes or re-opens the circuit depending on how it goes.
+    """
+    if lease is None:
+        lease = getattr(settings, "WEBHOOK_LEASE_SECONDS", 60)
+    now = timezone.now()
+    leased_until = now + timedelta(seconds=lease)
+    with transaction.atomic():
+        candidates = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(status="pending", next_attempt_at__lte=now)
+            .exclude(
+                webhook__circuit_state__in=("open", "half_open"),
+                webhook__circuit_open_until__gt=now,
+            )
+            .exclude(webhook_id__in=exclude_webhooks)
+            .select_related("webhook")
+            .order_by("next_attempt_at", "id")[:limit]
+        )
+
+        deliveries = []
+        trials = set()
+        for delivery in candidates:
+            webhook = delivery.webhook
+            if webhook.circuit_state != "closed":
+                if webhook.pk in trials:
+                    continue
+                trials.add(webhook.pk)
+            deliveries.append(delivery)
+
+        if trials:
+            # The conditional UPDATE makes the trial a compare-and-set: only
+            # the worker that moves the webhook to half-open may send it.
+            won = {
+                webhook_id
+                for webhook_id in trials
+                if Webhook.objects.filter(
+                    Q(circuit_open_until__lte=now) | Q(circuit_open_until=None),
+                    pk=webhook_id,
+                )
+                .exclude(circuit_state="closed")
+                .update(circuit_state="half_open", circuit_open_until=leased_until)
+            }
+            deliveries = [
+                delivery
+                for delivery in deliveries
+                if delivery.webhook.circuit_state == "closed"
+                or delivery.webhook_id in won
+            ]
+
+        deliveries = _coalesce(deliveries, now)
+        claimed_ids = [row.pk for item in deliveries for row in _rows(item)]
+        if claimed_ids:
+            WebhookDelivery.objects.filter(pk__in=claimed_ids).update(
+                next_attempt_at=leased_until
+            )
+    return deliveries
+
+
+def release_deliveries(deliveries):
+    """Give claimed deliveries back to the outbox, due again immediately."""
+    WebhookDelivery.objects.filter(
+        pk__in=[row.pk for item in deliveries for row in _rows(item)],
+        status="pending",
+    ).update(next_attempt_at=timezone.now())
+
+
+def _coalesce(deliveries, now):
+    """
+    Group the claimed rows of batching webhooks into :class:`DeliveryBatch`
+    objects of at most ``batch_max_events`` rows.
+
+    Rows are only grouped with rows that have been attempted as many times,
+    so a retried batch is resent exactly as it was and never picks up new
+    notifications. A due first-attempt row also pulls in the newer rows
+    still waiting out the same webhook's window, so one request carries all
+    of them.
+    """
+    items = []
+    batched = {}
+    for delivery in deliveries:
+        if delivery.webhook.batch_window_ms:
+            key = (delivery.webhook_id, delivery.attempts)
+            batched.setdefault(key, []).append(delivery)
+        else:
+            items.append(delivery)
+
+    for (webhook_id, attempts), rows in batched.items():
+        webhook = rows[0].webhook
+        size = webhook.batch_max_events
+        room = size - len(rows) % size if len(rows) % size else 0
+        if room and attempts == 0:
+            waiting = (
+                WebhookDelivery.objects.select_for_update(
+                    skip_locked=True, of=("self",)
+                )
+                .filter(
+                    webhook_id=webhook_id,
+                    status="pending",
+                    attempts=0,
+                    next_attempt_at__gt=now,
+                )
+                .order_by("next_attempt_at", "id")[:room]
+            )
+            for delivery in waiting:
+                delivery.webhook = webhook
+                rows.append(delivery)
+        items.extend(
+            DeliveryBatch(rows[start : start + size])
+            for start in range(0, len(rows), size)
+        )
+    return items
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait before retry number ``attempts``.
+
+    The delay doubles with every attempt, starting from
+    ``WEBHOOK_RETRY_BASE_DELAY`` (default 30) and capped at
+    ``WEBHOOK_RETRY_MAX_DELAY`` (default 6 hours). A random factor between
+    0.5 and 1 spreads out retries to the same receiver.
+    """
+    base = getattr(settings, "WEBHOOK_RETRY_BASE_DELAY", 30)
+    cap = getattr(settings, "WEBHOOK_RETRY_MAX_DELAY", 6 * 60 * 60)
+    return min(cap, base * 2 ** (attempts - 1)) * random.uniform(0.5, 1)
+
+
+def update_circuit(webhook_id, succeeded):
+    """
+    Count one attempt against the webhook and move its circuit breaker.
+
+    A success closes the circuit. ``WEBHOOK_CIRCUIT_THRESHOLD`` consecutive
+    failures (default 5) open it for ``WEBHOOK_CIRCUIT_COOLDOWN`` seconds
+    (default 300); a failed half-open trial opens it again. Returns ``True``
+    when this attempt left the circuit open.
+    """
+    webhooks = Webhook.objects.filter(pk=webhook_id)
+    if succeeded:
+        webhooks.update(
+            success_count=F("success_count") + 1,
+            consecutive_failures=0,
+            circuit_state="closed",
+            circuit_open_until=None,
+        )
+        return False
+
+    threshold = getattr(settings, "WEBHOOK_CIRCUIT_THRESHOLD", 5)
+    cooldown = getattr(settings, "WEBHOOK_CIRCUIT_COOLDOWN", 300)
+    webhooks.update(
+        failure_count=F("failure_count") + 1,
+        consecutive_failures=F("consecutive_failures") + 1,
+    )
+    opened = webhooks.filter(consecutive_failures__gte=threshold).update(
+        circuit_state="open",
+        circuit_open_until=timezone.now() + timedelta(seconds=cooldown),
+    )
+    if opened:
+        logger.warning(f"Circuit opened for webhook {webhook_id}")
+    return bool(opened)
+
+
+def record_outcome(delivery, outcome):
+    """
+    Store the result of one delivery attempt.
+
+    ``delivery`` is a :class:`WebhookDelivery` or a :class:`DeliveryBatch`,
+    whose rows all share the outcome. A failed delivery is rescheduled with
+    :func:`retry_delay` until it has been retried ``webhook.max_retries``
+    times. After that it is marked ``dead`` and no longer sent. Either way
+    the attempt counts once towards the webhook's health (see
+    :func:`update_circuit`). Returns ``True`` when the attempt left the
+    webhook's circuit open.
+    """
+    now = timezone.now()
+    rows = _rows(delivery)
+    webhook = delivery.webhook
+    # One delay for the whole batch keeps its rows together on retry.
+    retry_at = None
+    if outcome.error:
+        attempts = max(row.attempts for row in rows) + 1
+        retry_at = now + timedelta(seconds=retry_delay(attempts))
+
+    for row in rows:
+        row.attempts += 1
+        row.response_status = outcome.response_status
+        row.duration_ms = round(outcome.duration * 1000)
+        if not outcome.error:
+            row.status = "delivered"
+            row.delivered_at = now
+            row.last_error = ""
+        else:
+            row.last_error = outcome.error
+            if row.attempts > webhook.max_retries:
+                row.status = "dead"
+            else:
+                row.next_attempt_at = retry_at
+
+    with transaction.atomic():
+        WebhookDelivery.objects.bulk_update(
+            rows,
+            [
+                "attempts",
+                "response_status",
+                "duration_ms",
+                "status",
+                "delivered_at",
+                "last_error",
+                "next_attempt_at",
+            ],
+        )
+        return update_circuit(webhook.pk, succeeded=not outcome.error)
+
+
+def webhook_stats(webhooks):
+    """
+    Return ``{webhook_id: stats}`` for the organizer's webhook list.
+
+    ``stats`` holds the pending and dead delivery counts and a latency
+    histogram of the last attempt of each delivery made in the past
+    :data:`STATS_WINDOW`, as ``[(label, count), ...]``. One grouped query
+    covers all ``webhooks``.
+    """
+    since = timezone.now() - STATS_WINDOW
+    annotations = {
+        "pending": Count("id", filter=Q(status="pending")),
+        "dead": Count("id", filter=Q(status="dead")),
+    }
+    lower = 0
+    for index, upper in enumerate(LATENCY_BUCKETS):
+        bucket = Q(created_at__gte=since, duration_ms__gte=lower)
+        if upper is not None:
+            bucket &= Q(duration_ms__lt=upper)
+        annotations[f"bucket_{index}"] = Count("id", filter=bucket)
+        lower = upper
+    rows = (
+        WebhookDelivery.objects.filter(webhook__in=webhooks)
+        .values("webhook_id")
+        .annotate(**annotations)
+        .order_by()
+    )
+
+    stats = {}
+    for row in rows:
+        stats[row["webhook_id"]] = {
+            "pending": row["pending"],
+            "dead": row["dead"],
+            "latency": [
+                (label, row[f"bucket_{index}"])
+                for index, label in enumerate(LATENCY_LABELS)
+            ],
+        }
+    return stats
+
+
+def deliver_due(limit=None):
+    """
+    Claim and send one round of due deliveries and return the outbox rows
+    that were attempted.
+
+    The round is capped at what :data:`dispatcher`'s workers can send before
+    the lease runs out if every attempt takes the full timeout, so another
+    worker never re-claims a row that is still waiting here. Deliveries are
+    handed to the dispatcher as workers free up, and each outcome is
+    recorded as it arrives. Once a webhook's circuit opens, its deliveries
+    that have not been sent yet go back to the outbox instead of each
+    waiting out a timeout against a dead endpoint.
+    """
+    lease = getattr(settings, "WEBHOOK_LEASE_SECONDS", 60)
+    capacity = max(1, int(dispatcher.workers * lease / dispatcher.timeout))
+    limit = min(limit or dispatcher.queue_size, dispatcher.queue_size, capacity)
+    waiting = deque(claim_deliveries(limit, lease=lease))
+    in_flight = {}
+    attempted = []
+    unsent = []
+    tripped = set()
+
+    while waiting or in_flight:
+        while waiting and len(in_flight) < dispatcher.workers:
+            delivery = waiting.popleft()
+            if delivery.webhook.pk in tripped or not dispatcher.submit(delivery):
+                unsent.append(delivery)
+            else:
+                in_flight[delivery.pk] = delivery
+        if not in_flight:
+            break
+        [outcome] = dispatcher.collect(1)
+        delivery = in_flight.pop(outcome.delivery_id)
+        attempted.append(delivery)
+        if record_outcome(delivery, outcome):
+            tripped.add(delivery.webhook.pk)
+
+    if unsent:
+        release_deliveries(unsent)
+    return [row for item in attempted for row in _rows(item)]
+
+
+def _active_webhooks(event):
+    return list(
+        event.webhooks.filter(is_active=True).only(
+            "id", "url", "max_retries", "batch_window_ms", "batch_max_events"
+        )
+    )
+
+
+def trigger_registration_created_webhooks(*, event, registration, participant, answers):
+    """Record ``registration.created`` deliveries for the event's webhooks."""
+    webhooks = _active_webhooks(event)
+    if not webhooks:
+        return
+
+    payload = {
+        "event": "registration.created",
+        "mission_id": event.slug,
+        "mission_title": event.title,
+        "participant": {
+            "username": participant.username,
+            "email": getattr(participant, "email", ""),
+        },
+        "status": registration.status,
+        "registered_at": registration.registered_at,
+        "answers": answers,
+    }
+    record_deliveries(webhooks, "registration.created", [payload])
+
+
+def trigger_registration_status_changed_webhooks(*, event, registrations, old_status):
+    """
+    Record ``registration.status_changed`` deliveries for ``registrations``.
+
+    Active webhooks are looked up once, and all rows are inserted together,
+    for the whole batch.
+    """
+    webhooks = _active_webhooks(event)
+    if not webhooks:
+        return
 
-    thread = threading.Thread(target=send_request)
-    thread.daemon = True
-    thread.start()
+    updated_at = timezone.now()
+    payloads = [
+        {
+            "event": "registration.status_changed",
+            "mission_id": event.slug,
+            "mission_title": event.title,
+            "participant": {
+                "username": registration.participant.username,
+                "email": getattr(registration.participant, "email", ""),
+            },
+            "old_status": old_status,
+            "new_status": registration.status,
+            "updated_at": updated_at,
+        }
+        for registration in registrations
+    ]
+    record_deliveries(webhooks, "registration.status_changed", payloads)
@@ -36,11 +36,14 @@ Usage:
 """
 
 import argparse
+import hashlib
+import hmac
 import sys
 import json
+import time
 import requests
 from typing import Optional, Dict, Any
-from urllib.parse import urljoin
+from urllib.parse import parse_qs, urljoin, urlparse
 
 
 class EventHorizonClient:
@@ -115,9 +118,12 @@ class EventHorizonClient:
         """Get the authenticated user's profile"""
         return self._make_request("GET", "/accounts/api/me/")
 
-    def list_events(self, page: int = 1) -> Dict[Any, Any]:
-        """List all events"""
-        return self._make_request("GET", f"/api/events/?page={page}")
+    def list_events(
+        self, cursor: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Dict[Any, Any]:
+        """List one page of events, starting at ``cursor`` when given"""
+        params = {"cursor": cursor, "page_size": page_size}
+        return self._make_request("GET", "/api/events/", params=params)
 
     def get_event(self, event_id: int) -> Dict[Any, Any]:
         """Get a specific event by ID"""
@@ -164,6 +170,46 @@ def format_json(data: Any, indent: int = 2) -> str:
     return json.dumps(data, indent=indent, ensure_ascii=False)
 
 
+def verify_webhook_signature(
+    secret: str,
+    body: bytes,
+    headers: Dict[str, str],
+    tolerance: int = 300,
+    now: Optional[float] = None,
+) -> bool:
+    """
+    Check that a webhook request really came from Event Horizon.
+
+    Args:
+        secret: The webhook's secret, as entered on the webhook form
+        body: The raw request body, exactly as received (before JSON parsing)
+        headers: The request headers (names are matched case-insensitively)
+        tolerance: Maximum age of the request in seconds (default 5 minutes)
+        now: Current Unix time, for testing
+
+    Returns:
+        True when the signature matches and the timestamp is fresh.
+
+    The ``X-EventHorizon-Delivery`` id stays the same across retries. To
+    stop replays inside the tolerance window as well, remember the ids you
+    have processed for ``tolerance`` seconds and ignore repeats.
+    """
+    headers = {name.lower(): value for name, value in headers.items()}
+    timestamp = headers.get("x-eventhorizon-timestamp", "")
+    delivery_id = headers.get("x-eventhorizon-delivery", "")
+    signature = headers.get("x-eventhorizon-signature", "")
+    if not (timestamp.isdigit() and delivery_id and signature.startswith("sha256=")):
+        return False
+
+    if abs((time.time() if now is None else now) - int(timestamp)) > tolerance:
+        return False
+
+    mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+    mac.update(f"{timestamp}.{delivery_id}.".encode())
+    mac.update(body)
+    return hmac.compare_digest(signature[len("sha256=") :], mac.hexdigest())
+
+
 def handle_profile(client: EventHorizonClient, args: argparse.Namespace):
     """Handle profile command"""
     print("📋 Fetching user profile...")
@@ -190,19 +236,19 @@ def handle_profile(client: EventHorizonClient, args: argparse.Namespace):
 
 def handle_events_list(client: EventHorizonClient, args: argparse.Namespace):
     """Handle events list command"""
-    data = client.list_events(page=args.page)
-    events = data  # .get("results", [])
+    data = client.list_events(cursor=args.cursor, page_size=args.page_size)
+    events = data.get("results", [])
 
     if args.json:
         print(format_json(data))
         return
 
-    print(f"📅 Fetching events (page {args.page})...")
+    print("📅 Fetching events...")
     if not events:
         print("No events found.")
         return
 
-    print(f"\n✅ Found {len(events)} total events")
+    print(f"\n✅ Showing {len(events)} event(s)")
     print("=" * 60)
 
     for event in events:
@@ -212,7 +258,7 @@ def handle_events_list(client: EventHorizonClient, args: argparse.Namespace):
         print(f"   📅 Start: {event.get('start_time', 'N/A')}")
         print(f"   👤 Organizer: {event.get('organizer', {}).get('username', 'N/A')}")
         print(
-            f"   👥 Capacity: {event.get('current_attendees', 0)}/{event.get('capacity', 'unlimited')}"
+            f"   👥 Capacity: {event.get('registered_count', 0)}/{event.get('capacity', 'unlimited')}"
         )
 
         if event.get("description"):
@@ -221,9 +267,10 @@ def handle_events_list(client: EventHorizonClient, args: argparse.Namespace):
                 desc += "..."
             print(f"   📝 {desc}")
 
-    # # Pagination info
-    # if data.get("next"):
-    #     print(f"\n➡️  More events available. Use --page {args.page + 1}")
+    # Pagination info
+    if data.get("next"):
+        next_cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+        print(f"\n➡️  More events available. Use --cursor {next_cursor}")
 
 
 def handle_events_get(client: EventHorizonClient, args: argparse.Namespace):
@@ -241,7 +288,7 @@ def handle_events_get(client: EventHorizonClient, args: argparse.Namespace):
     print(f"📅 End: {event.get('end_time', 'N/A')}")
     print(f"\n👤 Organizer: {event.get('organizer', {}).get('username', 'N/A')}")
     print(
-        f"👥 Capacity: {event.get('current_attendees', 0)}/{event.get('max_attendees', 'unlimited')}"
+        f"👥 Capacity: {event.get('registered_count', 0)}/{event.get('max_attendees', 'unlimited')}"
     )
     print(f"📊 Status: {event.get('status', 'N/A')}")
 
@@ -427,7 +474,7 @@ def handle_registrations_attendees(
 ):
     """Handle view event attendees command (organizer only)"""
     print(f"👥 Fetching attendees for event {args.event_id}...")
-    registrations = client.get_event_registrations(args.event_id)
+    registrations = client.get_event_registrations(args.event_id).get("results", [])
 
     if not registrations:
         print("No registrations found for this event.")
@@ -490,7 +537,10 @@ def main():
     # Events list
     list_parser = events_subparsers.add_parser("list", help="List all events")
     list_parser.add_argument(
-        "--page", type=int, default=1, help="Page number (default: 1)"
+        "--cursor", help="Cursor printed at the end of the previous page"
+    )
+    list_parser.add_argument(
+        "--page-size", type=int, help="Number of events per page (default: 25)"
     )
 
     # Events get
@@ -18,11 +18,10 @@ from django.views.generic import TemplateView
 from django.views.generic import TemplateView as PlainTemplateView
 from django.http import JsonResponse
 from django.db import connection
-from django.core.cache import cache
 from django.db.models.manager import Manager
+from events.cache import upcoming_events
 from events.models import Event
-from typing import cast, Any
-from django.utils import timezone
+from typing import cast
 import datetime
 
 
@@ -31,19 +30,7 @@ class HomeView(TemplateView):
 
     def get_context_data(self, **kwargs):  # type: ignore[override]
         context = super().get_context_data(**kwargs)
-
-        cache_key = "home:upcoming_events:v1"
-        upcoming_events: Any = cache.get(cache_key)
-        if upcoming_events is None:
-            event_manager = cast(Manager, getattr(Event, "objects"))
-            upcoming_events = list(
-                event_manager.filter(start_time__gte=timezone.now())
-                .order_by("start_time")[:3]
-                .only("id", "slug", "title", "start_time", "location")
-            )
-            cache.set(cache_key, upcoming_events, timeout=60)
-
-        context["upcoming_events"] = upcoming_events
+        context["upcoming_events"] = upcoming_events()
         return context
 
 
@@ -60,19 +47,7 @@ class AboutView(PlainTemplateView):
 
     def get_context_data(self, **kwargs):  # type: ignore[override]
         context = super().get_context_data(**kwargs)
-
-        cache_key = "home:upcoming_events:v1"
-        upcoming_events: Any = cache.get(cache_key)
-        if upcoming_events is None:
-            event_manager = cast(Manager, getattr(Event, "objects"))
-            upcoming_events = list(
-                event_manager.filter(start_time__gte=timezone.now())
-                .order_by("start_time")[:3]
-                .only("id", "slug", "title", "start_time", "location")
-            )
-            cache.set(cache_key, upcoming_events, timeout=60)
-
-        context["upcoming_events"] = upcoming_events
+        context["upcoming_events"] = upcoming_events()
         return context
 
 
@@ -41,6 +41,12 @@ def get_storage_backend(storage_type: str = "media"):
     backend = getattr(settings, "STORAGE_BACKEND", "local").lower()
 
     if backend == "local":
+        if storage_type == "private":
+            # Private files live outside MEDIA_ROOT so they are never served
+            # as public media; views stream them after a permission check.
+            return FileSystemStorage(
+                location=getattr(settings, "PRIVATE_MEDIA_ROOT", None), base_url=None
+            )
         # Use Django's default filesystem storage
         return FileSystemStorage()
 
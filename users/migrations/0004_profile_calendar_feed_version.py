@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_profile_phone_number_sociallink"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="calendar_feed_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -30,6 +30,8 @@ class Profile(models.Model):
     location = models.CharField(max_length=30, blank=True)
     phone_number = models.CharField(max_length=15, blank=True)
     avatar = models.ImageField(upload_to="avatars/", null=True, blank=True)
+    # Signed into calendar feed tokens; bumping it revokes every issued link.
+    calendar_feed_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.user.username} Profile"